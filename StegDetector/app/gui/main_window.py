@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from functools import partial
 from pathlib import Path
+import io
 import subprocess
 import tempfile
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThread
 from PyQt5.QtWidgets import (
     QMainWindow,
     QWidget,
@@ -20,6 +22,7 @@ from PyQt5.QtWidgets import (
     QTabWidget,
     QPlainTextEdit,
     QCheckBox,
+    QProgressBar,
 )
 
 from core.utils_av import (
@@ -28,10 +31,115 @@ from core.utils_av import (
     extract_audio_from_video,
     ensure_dir,
 )
-from core.audio_detector import analyze_audio
-from core.video_detector import analyze_video
-from core.stego_audio import embed_lsb_audio, extract_lsb_audio
-from core.stego_video import embed_lsb_video, extract_lsb_video
+# core.stego_audio / core.stego_video are imported where they are used so
+# the window can be shown before numpy/imageio are loaded.
+
+from .workers import ANALYSIS_JOBS, AnalysisWorker, TaskWorker
+
+
+# Light, simple, "web-like" styling shared by the whole window.
+_STYLESHEET = """
+QWidget {
+    font-family: Segoe UI, Arial;
+    font-size: 10pt;
+}
+QMainWindow {
+    background-color: #f4f6fb;
+}
+QGroupBox {
+    border: 1px solid #d0d4e6;
+    border-radius: 6px;
+    margin-top: 8px;
+    padding: 6px 8px 8px 8px;
+    background-color: #ffffff;
+    font-weight: bold;
+}
+QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 3px 0 3px;
+}
+QPushButton {
+    background-color: #2563eb;
+    color: white;
+    border-radius: 6px;
+    padding: 6px 14px;
+    border: none;
+}
+QPushButton:hover {
+    background-color: #1d4ed8;
+}
+QPushButton:pressed {
+    background-color: #1e40af;
+}
+/* Secondary buttons (navigation) */
+QPushButton#secondaryButton {
+    background-color: #ffffff;
+    color: #2563eb;
+    border-radius: 6px;
+    padding: 6px 14px;
+    border: 1px solid #2563eb;
+}
+QPushButton#secondaryButton:hover {
+    background-color: #eff6ff;
+}
+QPushButton#secondaryButton:pressed {
+    background-color: #dbeafe;
+}
+QTabBar::tab {
+    padding: 8px 16px;
+}
+QPlainTextEdit {
+    background-color: #ffffff;
+    border: 1px solid #d1d5db;
+    border-radius: 4px;
+}
+QPlainTextEdit[disabledLook="true"] {
+    background-color: #e5e7eb;
+    color: #6b7280;
+}
+/* Short description at the top of each tab */
+QLabel#descLabel {
+    color: #4b5563;
+    font-size: 9.5pt;
+    margin-bottom: 4px;
+}
+QLabel#embed_status_label {
+    color: #059669;
+}
+"""
+
+# Raw PCM layout used when piping a video's audio track through ffmpeg.
+# Matches what extract_audio_from_video (MoviePy) writes: 44.1 kHz stereo.
+_TRACK_SAMPLE_RATE = 44100
+_TRACK_CHANNELS = 2
+
+_AV_FILTER = "Audio/Video (*.wav *.mp3 *.flac *.ogg *.mp4 *.avi *.mkv *.mov);;All files (*)"
+_NO_FILE_TEXT = "No file selected."
+_NO_COVER_TEXT = "No cover selected."
+
+_AUDIO_MSG_LABEL_VIDEO_COVER = (
+    "Message for AUDIO track (LSB on audio samples).\n"
+    "For audio-only covers, only this message is used.\n"
+    "If left empty in 'Both' mode, the video message is reused."
+)
+_AUDIO_MSG_LABEL_AUDIO_COVER = "Message for AUDIO file (LSB on samples):"
+
+# Embed tab layout per cover/mode:
+#   (where-to-hide group, video label+box, audio label+box, same-msg checkbox)
+_EMBED_VISIBILITY: dict[str, tuple[bool, bool, bool, bool]] = {
+    "audio_cover": (False, False, True, False),
+    "video": (True, True, False, False),
+    "audio_track": (True, False, True, False),
+    "both": (True, True, True, True),
+}
+
+
+def _text_or_empty(edit: QPlainTextEdit) -> str:
+    """Stripped editor text; skips copying the contents when it is empty."""
+    if edit.document().isEmpty():
+        return ""
+    return edit.toPlainText().strip()
 
 
 class MainWindow(QMainWindow):
@@ -59,6 +167,15 @@ class MainWindow(QMainWindow):
         # Widgets we need to access later
         self.analysis_file_label: QLabel | None = None
         self.analysis_results: QPlainTextEdit | None = None
+        self.analysis_run_btn: QPushButton | None = None
+        self.analysis_progress: QProgressBar | None = None
+
+        # Background analysis threads (kept referenced so they are not GC'd)
+        self._active_threads: list[tuple[QThread, AnalysisWorker]] = []
+        # Embed / extract runs: (thread, worker, button disabled meanwhile)
+        self._task_threads: list[tuple[QThread, TaskWorker, QPushButton | None]] = []
+        self.embed_btn: QPushButton | None = None
+        self.extract_btn: QPushButton | None = None
 
         self.mode_auto: QRadioButton | None = None
         self.mode_audio_only: QRadioButton | None = None
@@ -76,6 +193,7 @@ class MainWindow(QMainWindow):
         self.embed_label_video: QLabel | None = None
         self.embed_label_audio: QLabel | None = None
         self.same_msg_checkbox: QCheckBox | None = None
+        self._embed_target_buttons: QButtonGroup | None = None
 
         self.extract_file_label: QLabel | None = None
         self.extract_message_view: QPlainTextEdit | None = None
@@ -83,6 +201,14 @@ class MainWindow(QMainWindow):
         self.extract_mode_video: QRadioButton | None = None
         self.extract_mode_audio_track: QRadioButton | None = None
         
+        # One scratch dir for the whole session + audio tracks already extracted
+        self._tmp_dir = Path(tempfile.gettempdir()) / "stegdetector_tmp"
+        ensure_dir(str(self._tmp_dir))
+        self._wav_cache: dict[tuple[str, float, int], Path] = {}
+
+        # Last visibility we applied per widget, see _apply_visibility()
+        self._vis_state: dict[QWidget, bool] = {}
+
         # Tabs + cross-navigation buttons
         self.tabs: QTabWidget | None = None
         self.analysis_tab: QWidget | None = None
@@ -92,7 +218,15 @@ class MainWindow(QMainWindow):
         self.btn_go_to_extract: QPushButton | None = None
         self.btn_go_to_analysis: QPushButton | None = None
 
+        # Embed / Extract are built lazily, see _lazy_build_tab()
+        self._embed_built: bool = False
+        self._extract_built: bool = False
+        # Embed visibility changed while the tab was not shown
+        self._embed_dirty: bool = True
+
         self.extract_type_label: QLabel | None = None
+        # (is_audio, is_video) of extract_selected_file, set by _select_extract_file()
+        self._extract_kind: tuple[bool, bool] = (False, False)
 
 
         self._apply_style()
@@ -102,71 +236,7 @@ class MainWindow(QMainWindow):
     # Styling
     # ------------------------------------------------------------------
     def _apply_style(self) -> None:
-        # Light, simple, "web-like" styling
-        self.setStyleSheet(
-            """
-            QWidget {
-                font-family: Segoe UI, Arial;
-                font-size: 10pt;
-            }
-            QMainWindow {
-                background-color: #f4f6fb;
-            }
-            QGroupBox {
-                border: 1px solid #d0d4e6;
-                border-radius: 6px;
-                margin-top: 8px;
-                padding: 6px 8px 8px 8px;
-                background-color: #ffffff;
-                font-weight: bold;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 3px 0 3px;
-            }
-            QPushButton {
-                background-color: #2563eb;
-                color: white;
-                border-radius: 6px;
-                padding: 6px 14px;
-                border: none;
-            }
-            QPushButton:hover {
-                background-color: #1d4ed8;
-            }
-            QPushButton:pressed {
-                background-color: #1e40af;
-            }
-            /* Secondary buttons (navigation) */
-            QPushButton#secondaryButton {
-                background-color: #ffffff;
-                color: #2563eb;
-                border-radius: 6px;
-                padding: 6px 14px;
-                border: 1px solid #2563eb;
-            }
-            QPushButton#secondaryButton:hover {
-                background-color: #eff6ff;
-            }
-            QPushButton#secondaryButton:pressed {
-                background-color: #dbeafe;
-            }
-            QTabBar::tab {
-                padding: 8px 16px;
-                margin: 2px;
-            }
-            QPlainTextEdit {
-                background-color: #ffffff;
-                border: 1px solid #d1d5db;
-                border-radius: 4px;
-            }
-            QLabel.type-label {
-                color: #4b5563;
-                font-style: italic;
-            }
-            """
-        )
+        self.setStyleSheet(_STYLESHEET)
 
 
     # ------------------------------------------------------------------
@@ -182,32 +252,83 @@ class MainWindow(QMainWindow):
         # cross-navigation (Go to Analysis / Go to Extract) can work.
         self.tabs = QTabWidget()
 
+        # Analysis is the landing tab and is built right away; Embed and
+        # Extract start as empty placeholders and are built on first use.
         self.analysis_tab = self._build_analysis_tab()
-        self.embed_tab = self._build_embed_tab()
-        self.extract_tab = self._build_extract_tab()
+        self.embed_tab = QWidget()
+        self.extract_tab = QWidget()
 
         self.tabs.addTab(self.analysis_tab, "Analysis")
         self.tabs.addTab(self.embed_tab, "Embed")
         self.tabs.addTab(self.extract_tab, "Extract")
+        self.tabs.currentChanged.connect(self._lazy_build_tab)
 
         main_layout.addWidget(self.tabs)
 
+    def _lazy_build_tab(self, index: int) -> None:
+        """
+        Build the Embed / Extract tab the first time it is activated, and
+        apply any embed visibility change that was deferred while hidden.
+        """
+        if index == 1:
+            if not self._embed_built:
+                self._embed_built = True
+                self.embed_tab = self._replace_tab(
+                    1, self._build_embed_tab(), "Embed"
+                )
+            if self._embed_dirty:
+                self._refresh_embed_visibility()
+        elif index == 2 and not self._extract_built:
+            self._extract_built = True
+            self.extract_tab = self._replace_tab(
+                2, self._build_extract_tab(), "Extract"
+            )
+            self._sync_extract_tab()
+
+    def _replace_tab(self, index: int, page: QWidget, title: str) -> QWidget:
+        placeholder = self.tabs.widget(index)
+        # Don't let remove/insert re-trigger _lazy_build_tab for other tabs
+        self.tabs.blockSignals(True)
+        try:
+            self.tabs.removeTab(index)
+            self.tabs.insertTab(index, page, title)
+            self.tabs.setCurrentIndex(index)
+        finally:
+            self.tabs.blockSignals(False)
+        if placeholder is not None:
+            placeholder.deleteLater()
+        return page
+
+    def _sync_extract_tab(self) -> None:
+        """Show the file that was selected elsewhere before Extract was built."""
+        p = self.extract_selected_file
+        if p is None:
+            return
+        if self.extract_file_label:
+            self.extract_file_label.setText(f"Selected: {p}")
+        self._update_extract_type_label()
+        self._configure_extract_radios_for_path()
+        if self.btn_go_to_analysis:
+            self.btn_go_to_analysis.setEnabled(True)
+
 
     # ------------------------- Analysis tab ----------------------------
     def _build_analysis_tab(self) -> QWidget:
         page = QWidget()
         layout = QVBoxLayout(page)
+        layout.setSpacing(8)
+        layout.setContentsMargins(8, 8, 8, 8)
         
         desc = QLabel("Check if an audio or video file is likely clean or stego.")
         desc.setWordWrap(True)
-        desc.setStyleSheet("color: #4b5563; font-size: 9.5pt; margin-bottom: 4px;")
+        desc.setObjectName("descLabel")
         layout.addWidget(desc)
 
 
         # File selection group
         file_group = QGroupBox("1. Select audio or video file")
         file_layout = QHBoxLayout()
-        self.analysis_file_label = QLabel("No file selected.")
+        self.analysis_file_label = QLabel(_NO_FILE_TEXT)
         browse_btn = QPushButton("Choose File...")
         browse_btn.clicked.connect(self.on_analysis_browse)
 
@@ -223,11 +344,8 @@ class MainWindow(QMainWindow):
         self.mode_video_only = QRadioButton("Video only")
         self.mode_auto.setChecked(True)
 
-        mode_buttons = QButtonGroup(self)
-        mode_buttons.addButton(self.mode_auto)
-        mode_buttons.addButton(self.mode_audio_only)
-        mode_buttons.addButton(self.mode_video_only)
-
+        # The radios share mode_group as parent, so autoExclusive already
+        # makes them mutually exclusive; no QButtonGroup needed.
         mode_layout.addWidget(self.mode_auto)
         mode_layout.addWidget(self.mode_audio_only)
         mode_layout.addWidget(self.mode_video_only)
@@ -236,6 +354,7 @@ class MainWindow(QMainWindow):
         # Run button
         run_btn = QPushButton("Run Analysis")
         run_btn.clicked.connect(self.on_run_analysis)
+        self.analysis_run_btn = run_btn
 
         # NEW: button to jump to Extract tab
         self.btn_go_to_extract = QPushButton("Go to Extract")
@@ -249,30 +368,34 @@ class MainWindow(QMainWindow):
         btn_row.addStretch()
 
 
+        # Progress of the audio-track extraction (only shown while it runs)
+        self.analysis_progress = QProgressBar()
+        self.analysis_progress.setRange(0, 100)
+        self.analysis_progress.setFormat("Extracting audio track... %p%")
+        self.analysis_progress.setVisible(False)
+
         # Results viewer
         self.analysis_results = QPlainTextEdit()
         self.analysis_results.setReadOnly(True)
 
         layout.addWidget(file_group)
-        layout.addSpacing(8)
         layout.addWidget(mode_group)
-        layout.addSpacing(8)
         layout.addLayout(btn_row)
-        layout.addSpacing(8)
+        layout.addWidget(self.analysis_progress)
         layout.addWidget(self.analysis_results, 1)
 
-
-
         return page
 
     # --------------------------- Embed tab -----------------------------
     def _build_embed_tab(self) -> QWidget:
         page = QWidget()
         layout = QVBoxLayout(page)
+        layout.setSpacing(8)
+        layout.setContentsMargins(8, 8, 8, 8)
         
         desc = QLabel("Hide a secret message inside an audio or video file using LSB steganography.")
         desc.setWordWrap(True)
-        desc.setStyleSheet("color: #4b5563; font-size: 9.5pt; margin-bottom: 4px;")
+        desc.setObjectName("descLabel")
         layout.addWidget(desc)
 
 
@@ -280,7 +403,7 @@ class MainWindow(QMainWindow):
         file_group = QGroupBox("1. Select cover file (audio or video)")
         file_layout = QVBoxLayout()
         top_row = QHBoxLayout()
-        self.embed_file_label = QLabel("No cover selected.")
+        self.embed_file_label = QLabel(_NO_COVER_TEXT)
         browse_btn = QPushButton("Choose Cover...")
         browse_btn.clicked.connect(self.on_embed_browse)
         top_row.addWidget(self.embed_file_label, 1)
@@ -307,10 +430,10 @@ class MainWindow(QMainWindow):
         target_buttons.addButton(self.embed_mode_audio_only)
         target_buttons.addButton(self.embed_mode_both)
 
-        # hook visibility updates
-        self.embed_mode_video_only.toggled.connect(self._refresh_embed_visibility)
-        self.embed_mode_audio_only.toggled.connect(self._refresh_embed_visibility)
-        self.embed_mode_both.toggled.connect(self._refresh_embed_visibility)
+        # hook visibility updates: one group-level signal, and only react to the
+        # newly checked button so a mode switch refreshes exactly once
+        target_buttons.buttonToggled.connect(self._on_embed_mode_toggled)
+        self._embed_target_buttons = target_buttons
 
         target_layout.addWidget(self.embed_mode_video_only)
         target_layout.addWidget(self.embed_mode_audio_only)
@@ -327,11 +450,7 @@ class MainWindow(QMainWindow):
             "Example: Stego in video frames only..."
         )
 
-        self.embed_label_audio = QLabel(
-            "Message for AUDIO track (LSB on audio samples).\n"
-            "For audio-only covers, only this message is used.\n"
-            "If left empty in 'Both' mode, the video message is reused."
-        )
+        self.embed_label_audio = QLabel(_AUDIO_MSG_LABEL_VIDEO_COVER)
         self.embed_message_audio_edit = QPlainTextEdit()
         self.embed_message_audio_edit.setPlaceholderText(
             "Example: Separate message hidden in audio..."
@@ -351,6 +470,7 @@ class MainWindow(QMainWindow):
         bottom_row = QHBoxLayout()
         embed_btn = QPushButton("Embed (LSB)")
         embed_btn.clicked.connect(self.on_embed_clicked)
+        self.embed_btn = embed_btn
 
         self.embed_status_label = QLabel("")
         self.embed_status_label.setObjectName("embed_status_label")
@@ -359,27 +479,24 @@ class MainWindow(QMainWindow):
         bottom_row.addWidget(self.embed_status_label, 1)
 
         layout.addWidget(file_group)
-        layout.addSpacing(8)
         layout.addWidget(target_group)
-        layout.addSpacing(8)
         layout.addWidget(msg_group, 1)
-        layout.addSpacing(8)
         layout.addLayout(bottom_row)
 
-
-        # initial visibility (no cover yet -> treat as video, both)
-        self._refresh_embed_visibility()
-
+        # initial visibility (no cover yet -> treat as video, both) is
+        # applied by _lazy_build_tab once the page is the current tab
         return page
 
     # --------------------------- Extract tab ---------------------------
     def _build_extract_tab(self) -> QWidget:
         page = QWidget()
         layout = QVBoxLayout(page)
+        layout.setSpacing(8)
+        layout.setContentsMargins(8, 8, 8, 8)
         
         desc = QLabel("Try to recover a hidden LSB text message from an audio or video file.")
         desc.setWordWrap(True)
-        desc.setStyleSheet("color: #4b5563; font-size: 9.5pt; margin-bottom: 4px;")
+        desc.setObjectName("descLabel")
         layout.addWidget(desc)
 
 
@@ -389,7 +506,7 @@ class MainWindow(QMainWindow):
         f_layout = QVBoxLayout()
         top_row = QHBoxLayout()
 
-        self.extract_file_label = QLabel("No file selected.")
+        self.extract_file_label = QLabel(_NO_FILE_TEXT)
         browse_btn = QPushButton("Choose File...")
         browse_btn.clicked.connect(self.on_extract_browse)
 
@@ -420,11 +537,7 @@ class MainWindow(QMainWindow):
         self.extract_mode_audio_track = QRadioButton("Audio track of video")
         self.extract_mode_auto.setChecked(True)
 
-        src_buttons = QButtonGroup(self)
-        src_buttons.addButton(self.extract_mode_auto)
-        src_buttons.addButton(self.extract_mode_video)
-        src_buttons.addButton(self.extract_mode_audio_track)
-
+        # Mutually exclusive through autoExclusive (same parent: src_group)
         s_layout.addWidget(self.extract_mode_auto)
         s_layout.addWidget(self.extract_mode_video)
         s_layout.addWidget(self.extract_mode_audio_track)
@@ -432,6 +545,7 @@ class MainWindow(QMainWindow):
 
         extract_btn = QPushButton("Extract Message (LSB)")
         extract_btn.clicked.connect(self.on_extract_clicked)
+        self.extract_btn = extract_btn
 
         # NEW: button to jump to Analysis tab
         self.btn_go_to_analysis = QPushButton("Go to Analysis")
@@ -449,17 +563,29 @@ class MainWindow(QMainWindow):
         self.extract_message_view.setReadOnly(True)
 
         layout.addWidget(file_group)
-        layout.addSpacing(8)
         layout.addWidget(src_group)
-        layout.addSpacing(8)
         layout.addLayout(btn_row)
-        layout.addSpacing(8)
         layout.addWidget(self.extract_message_view, 1)
 
-
         return page
 
 
+    # ------------------------------------------------------------------
+    # File type helper
+    # ------------------------------------------------------------------
+    def _classify(self, p: Path | str) -> tuple[bool, bool]:
+        """
+        Return (is_audio, is_video) for a path. Both checks are lru_cached
+        in core.utils_av, so repeated handlers on one selection are cheap.
+        """
+        key = str(p)
+        return is_audio_file(key), is_video_file(key)
+
+    def _select_extract_file(self, p: Path) -> None:
+        """Make `p` the Extract tab's file and classify it once for its handlers."""
+        self.extract_selected_file = p
+        self._extract_kind = self._classify(p)
+
     # ------------------------------------------------------------------
     # Analysis logic
     # ------------------------------------------------------------------
@@ -468,7 +594,7 @@ class MainWindow(QMainWindow):
             self,
             "Select audio or video file",
             "",
-            "Audio/Video (*.wav *.mp3 *.flac *.ogg *.mp4 *.avi *.mkv *.mov);;All files (*)",
+            _AV_FILTER,
         )
         if not path:
             return
@@ -484,16 +610,15 @@ class MainWindow(QMainWindow):
             self.analysis_file_label.setText(f"Selected: {p}")
 
               # Keep Extract tab in sync for good UX
+        self._select_extract_file(p)
         if self.extract_file_label is not None:
-            self.extract_selected_file = p
             self.extract_file_label.setText(f"Selected: {p}")
             # NEW:
-            self._update_extract_type_label(p)
+            self._update_extract_type_label()
 
 
         if self.analysis_results:
-            self.analysis_results.clear()
-            self.analysis_results.appendPlainText(f"Analyzing: {p}\n")
+            self.analysis_results.setPlainText(f"Analyzing: {p}\n")
 
     def on_run_analysis(self) -> None:
         if self.analysis_selected_file is None:
@@ -501,8 +626,7 @@ class MainWindow(QMainWindow):
             return
 
         path = str(self.analysis_selected_file)
-        is_a = is_audio_file(path)
-        is_v = is_video_file(path)
+        is_a, is_v = self._classify(self.analysis_selected_file)
         if not is_a and not is_v:
             QMessageBox.warning(
                 self,
@@ -529,88 +653,94 @@ class MainWindow(QMainWindow):
         elif self.mode_video_only is not None and self.mode_video_only.isChecked():
             run_video = True
 
+        jobs: list[str] = []
         if run_audio:
             if is_a:
-                self._run_audio_analysis(path)
+                jobs.append("audio")
             elif is_v:
-                self._run_video_audio_track_analysis(path)
+                jobs.append("audio_track")
 
         if run_video and is_v:
-            self._run_video_analysis(path)
-
-    def _append_analysis(self, text: str) -> None:
-        if self.analysis_results:
-            self.analysis_results.appendPlainText(text)
-
-    def _run_audio_analysis(self, audio_path: str) -> None:
-        self._append_analysis("=== Audio Analysis ===")
-        try:
-            res = analyze_audio(audio_path)
-        except Exception as e:
-            self._append_analysis(f"Error during audio analysis: {e}\n")
-            return
-
-        best_score = res.get("best_score")
-        best_method = res.get("best_method")
-        self._append_analysis(f"Best audio method: {best_method}")
-        self._append_analysis(f"Best audio score: {best_score}\n")
-
-        for r in res.get("methods", []):
-            self._append_analysis(f"- Method: {r.get('method')}")
-            self._append_analysis(f"  Score: {r.get('score')}")
-            self._append_analysis(f"  Verdict: {r.get('verdict')}\n")
-
-    def _run_video_analysis(self, video_path: str) -> None:
-        self._append_analysis("=== Video Analysis (Frames) ===")
-        try:
-            res = analyze_video(video_path)
-        except Exception as e:
-            self._append_analysis(f"Error during video analysis: {e}\n")
-            return
-
-        best_score = res.get("best_score")
-        best_method = res.get("best_method")
-        self._append_analysis(f"Best video method: {best_method}")
-        self._append_analysis(f"Best video score: {best_score}\n")
-
-        for r in res.get("methods", []):
-            self._append_analysis(f"- Method: {r.get('method')}")
-            self._append_analysis(f"  Score: {r.get('score')}")
-            self._append_analysis(f"  Verdict: {r.get('verdict')}\n")
+            jobs.append("video")
 
-    def _run_video_audio_track_analysis(self, video_path: str) -> None:
-        self._append_analysis("=== Audio Track from Video ===")
-        temp_dir = Path(tempfile.gettempdir()) / "stegdetector_tmp"
-        ensure_dir(str(temp_dir))
-        tmp_wav = temp_dir / "extracted_audio_for_analysis.wav"
+        if jobs:
+            self._start_analysis(path, jobs)
 
-        try:
-            ok = extract_audio_from_video(video_path, str(tmp_wav))
-        except Exception as e:
-            self._append_analysis(f"Could not extract audio track: {e}\n")
+    def _start_analysis(self, path: str, jobs: list[str]) -> None:
+        """
+        Run each selected detector in its own QThread so the window stays
+        responsive. The jobs share no state, so for a video in Auto mode the
+        audio-track and frame analyses run side by side and each result is
+        rendered (on the GUI thread) as soon as it arrives.
+        """
+        for kind in jobs:
+            self._start_analysis_thread(path, kind)
+        if self.analysis_run_btn:
+            self.analysis_run_btn.setEnabled(False)
+
+    def _start_analysis_thread(self, path: str, kind: str) -> None:
+        thread = QThread(self)
+        worker = AnalysisWorker(path, [kind], self._tmp_dir, self._wav_cache)
+        worker.moveToThread(thread)
+
+        thread.started.connect(worker.run)
+        worker.result.connect(self._render_analysis_result)
+        worker.error.connect(self._append_analysis)
+        worker.extract_progress.connect(self._on_extract_progress)
+        worker.finished.connect(self._remember_audio_track_wav)
+        worker.finished.connect(thread.quit)
+        worker.finished.connect(worker.deleteLater)
+        thread.finished.connect(self._on_analysis_thread_finished)
+        thread.finished.connect(thread.deleteLater)
+
+        self._active_threads.append((thread, worker))
+        thread.start()
+
+    def _remember_audio_track_wav(self, extracted) -> None:
+        """Cache the audio-track WAV a worker extracted, on the GUI thread."""
+        if extracted is not None:
+            key, wav = extracted
+            self._wav_cache[key] = wav
+
+    def _on_analysis_thread_finished(self) -> None:
+        thread = self.sender()
+        self._active_threads = [
+            (t, w) for t, w in self._active_threads if t is not thread
+        ]
+        if self._active_threads:
             return
+        if self.analysis_run_btn:
+            self.analysis_run_btn.setEnabled(True)
+        if self.analysis_progress:
+            self.analysis_progress.setVisible(False)
 
-        if not ok:
-            self._append_analysis(
-                "Could not extract audio track: Video has no audio track.\n"
-            )
+    def _on_extract_progress(self, percent: int) -> None:
+        if self.analysis_progress is None:
             return
+        self.analysis_progress.setValue(percent)
+        self.analysis_progress.setVisible(percent < 100)
 
-        try:
-            res = analyze_audio(str(tmp_wav))
-        except Exception as e:
-            self._append_analysis(f"Error during audio track analysis: {e}\n")
-            return
+    def _append_analysis(self, text: str) -> None:
+        if self.analysis_results:
+            self.analysis_results.appendPlainText(text)
 
-        best_score = res.get("best_score")
-        best_method = res.get("best_method")
-        self._append_analysis(f"Best audio-track method: {best_method}")
-        self._append_analysis(f"Best audio-track score: {best_score}\n")
+    def _render_analysis_result(self, kind: str, res: dict) -> None:
+        header, label = ANALYSIS_JOBS[kind]
 
+        # Build the whole block first and hand it to the editor in one call,
+        # so the document is laid out / repainted once per result and blocks
+        # from parallel jobs never interleave.
+        lines = [
+            header,
+            f"Best {label} method: {res.get('best_method')}",
+            f"Best {label} score: {res.get('best_score')}\n",
+        ]
         for r in res.get("methods", []):
-            self._append_analysis(f"- Method: {r.get('method')}")
-            self._append_analysis(f"  Score: {r.get('score')}")
-            self._append_analysis(f"  Verdict: {r.get('verdict')}\n")
+            lines.append(f"- Method: {r.get('method')}")
+            lines.append(f"  Score: {r.get('score')}")
+            lines.append(f"  Verdict: {r.get('verdict')}\n")
+
+        self._append_analysis("\n".join(lines))
 
     # ------------------------------------------------------------------
     # Embed visibility helpers
@@ -620,131 +750,83 @@ class MainWindow(QMainWindow):
         Show/hide the 'where to hide' group and message textboxes
         depending on whether the current cover is audio or video
         and which radio button is selected.
+
+        Deferred (marked dirty) while the Embed tab is not the current tab.
         """
         if self.embed_where_group is None:
             return
+        if self.tabs is None or self.tabs.currentWidget() is not self.embed_tab:
+            self._embed_dirty = True
+            return
+        self._embed_dirty = False
 
-        is_audio_cover = self.embed_cover_is_audio
-
-        # Helper to set "disabled" look for the audio message box
-        def _set_audio_box_enabled(enabled: bool) -> None:
-            if not self.embed_message_audio_edit:
-                return
-            self.embed_message_audio_edit.setEnabled(enabled)
-            if enabled:
-                # reset to default style
-                self.embed_message_audio_edit.setStyleSheet("")
-            else:
-                # light grey background to show it's not usable
-                self.embed_message_audio_edit.setStyleSheet(
-                    "background-color: #e5e7eb; color: #6b7280;"
-                )
-
-        if is_audio_cover:
-            # Audio cover: no "where to hide" choices, only audio message box
-            self.embed_where_group.setVisible(False)
-
-            if self.embed_label_video:
-                self.embed_label_video.setVisible(False)
-            if self.embed_message_video_edit:
-                self.embed_message_video_edit.setVisible(False)
-
-            if self.embed_label_audio:
-                self.embed_label_audio.setText(
-                    "Message for AUDIO file (LSB on samples):"
-                )
-                self.embed_label_audio.setVisible(True)
-
-            if self.embed_message_audio_edit:
-                self.embed_message_audio_edit.setVisible(True)
-
-            # Always active (no "same message" option in audio-only mode)
-            _set_audio_box_enabled(True)
-
-            if self.same_msg_checkbox:
-                self.same_msg_checkbox.setVisible(False)
-
+        if self.embed_cover_is_audio:
+            mode = "audio_cover"
+        elif self.embed_mode_video_only and self.embed_mode_video_only.isChecked():
+            mode = "video"
+        elif self.embed_mode_audio_only and self.embed_mode_audio_only.isChecked():
+            mode = "audio_track"
         else:
-            # Video cover
-            self.embed_where_group.setVisible(True)
+            mode = "both"
+
+        where, video_box, audio_box, same_box = _EMBED_VISIBILITY[mode]
+        self._apply_visibility(
+            {
+                self.embed_where_group: where,
+                self.embed_label_video: video_box,
+                self.embed_message_video_edit: video_box,
+                self.embed_label_audio: audio_box,
+                self.embed_message_audio_edit: audio_box,
+                self.same_msg_checkbox: same_box,
+            }
+        )
 
-            mode_video = (
-                self.embed_mode_video_only.isChecked()
-                if self.embed_mode_video_only
-                else False
+        if self.embed_label_audio:
+            text = (
+                _AUDIO_MSG_LABEL_AUDIO_COVER
+                if mode == "audio_cover"
+                else _AUDIO_MSG_LABEL_VIDEO_COVER
             )
-            mode_audio = (
-                self.embed_mode_audio_only.isChecked()
-                if self.embed_mode_audio_only
+            if self.embed_label_audio.text() != text:
+                self.embed_label_audio.setText(text)
+
+        if mode == "both":
+            use_same = (
+                self.same_msg_checkbox.isChecked()
+                if self.same_msg_checkbox
                 else False
             )
-            mode_both = (
-                self.embed_mode_both.isChecked() if self.embed_mode_both else False
-            )
-
-            # Restore audio label text
-            if self.embed_label_audio:
-                self.embed_label_audio.setText(
-                    "Message for AUDIO track (LSB on audio samples).\n"
-                    "For audio-only covers, only this message is used.\n"
-                    "If left empty in 'Both' mode, the video message is reused."
-                )
-
-            if mode_video:
-                # Only video textbox
-                if self.embed_label_video:
-                    self.embed_label_video.setVisible(True)
-                if self.embed_message_video_edit:
-                    self.embed_message_video_edit.setVisible(True)
-
-                if self.embed_label_audio:
-                    self.embed_label_audio.setVisible(False)
-                if self.embed_message_audio_edit:
-                    self.embed_message_audio_edit.setVisible(False)
-
-                if self.same_msg_checkbox:
-                    self.same_msg_checkbox.setVisible(False)
-
-            elif mode_audio:
-                # Only audio textbox
-                if self.embed_label_video:
-                    self.embed_label_video.setVisible(False)
-                if self.embed_message_video_edit:
-                    self.embed_message_video_edit.setVisible(False)
-
-                if self.embed_label_audio:
-                    self.embed_label_audio.setVisible(True)
-                if self.embed_message_audio_edit:
-                    self.embed_message_audio_edit.setVisible(True)
-
-                # Active textbox, no "same message" logic
-                _set_audio_box_enabled(True)
-
-                if self.same_msg_checkbox:
-                    self.same_msg_checkbox.setVisible(False)
-
-            else:
-                # Both video+audio
-                if self.embed_label_video:
-                    self.embed_label_video.setVisible(True)
-                if self.embed_message_video_edit:
-                    self.embed_message_video_edit.setVisible(True)
-
-                if self.embed_label_audio:
-                    self.embed_label_audio.setVisible(True)
-                if self.embed_message_audio_edit:
-                    self.embed_message_audio_edit.setVisible(True)
-
-                if self.same_msg_checkbox:
-                    self.same_msg_checkbox.setVisible(True)
-
-                use_same = (
-                    self.same_msg_checkbox.isChecked()
-                    if self.same_msg_checkbox
-                    else False
-                )
-                # Grey-out audio text box when same-message is ON
-                _set_audio_box_enabled(not use_same)
+            # Grey-out audio text box when same-message is ON
+            self._set_audio_box_enabled(not use_same)
+        elif mode != "video":
+            # Active textbox, no "same message" logic
+            self._set_audio_box_enabled(True)
+
+    def _on_embed_mode_toggled(self, _button: QRadioButton, checked: bool) -> None:
+        if checked:
+            self._refresh_embed_visibility()
+
+    def _apply_visibility(self, desired: dict[QWidget | None, bool]) -> None:
+        """Call setVisible only on widgets whose visibility actually changes."""
+        for w, visible in desired.items():
+            if w is None or self._vis_state.get(w) is visible:
+                continue
+            w.setVisible(visible)
+            self._vis_state[w] = visible
+
+    def _set_audio_box_enabled(self, enabled: bool) -> None:
+        """Enable the audio message box, or grey it out when it is not usable."""
+        w = self.embed_message_audio_edit
+        if w is None:
+            return
+        if w.isEnabled() == enabled and bool(w.property("disabledLook")) != enabled:
+            return
+        w.setEnabled(enabled)
+        # light grey background (see _STYLESHEET) to show it's not usable;
+        # re-polish so the property selector is re-evaluated
+        w.setProperty("disabledLook", not enabled)
+        w.style().unpolish(w)
+        w.style().polish(w)
 
 
     # ------------------------------------------------------------------
@@ -755,7 +837,7 @@ class MainWindow(QMainWindow):
             self,
             "Select cover file",
             "",
-            "Audio/Video (*.wav *.mp3 *.flac *.ogg *.mp4 *.avi *.mkv *.mov);;All files (*)",
+            _AV_FILTER,
         )
         if not path:
             return
@@ -765,8 +847,7 @@ class MainWindow(QMainWindow):
         if self.embed_file_label:
             self.embed_file_label.setText(f"Cover: {p}")
 
-        is_a = is_audio_file(str(p))
-        is_v = is_video_file(str(p))
+        is_a, is_v = self._classify(p)
         self.embed_cover_is_audio = bool(is_a and not is_v)
 
         kind = "Unknown"
@@ -791,8 +872,7 @@ class MainWindow(QMainWindow):
             return
 
         cover_path = self.embed_selected_cover
-        is_a = is_audio_file(str(cover_path))
-        is_v = is_video_file(str(cover_path))
+        is_a, is_v = self._classify(cover_path)
         if not is_a and not is_v:
             QMessageBox.warning(
                 self,
@@ -804,9 +884,9 @@ class MainWindow(QMainWindow):
         msg_video = ""
         msg_audio = ""
         if self.embed_message_video_edit and self.embed_message_video_edit.isVisible():
-            msg_video = self.embed_message_video_edit.toPlainText().strip()
+            msg_video = _text_or_empty(self.embed_message_video_edit)
         if self.embed_message_audio_edit and self.embed_message_audio_edit.isVisible():
-            msg_audio = self.embed_message_audio_edit.toPlainText().strip()
+            msg_audio = _text_or_empty(self.embed_message_audio_edit)
 
         if not msg_video and not msg_audio:
             QMessageBox.warning(
@@ -825,7 +905,7 @@ class MainWindow(QMainWindow):
                 # Audio covers: always embed into audio samples
                 if not msg_audio:
                     msg_audio = msg_video
-                out_path = self._embed_audio_only(cover_path, msg_audio)
+                job = partial(self._embed_audio_only, cover_path, msg_audio)
             else:
                 # Video covers
                 mode = "both"
@@ -843,11 +923,11 @@ class MainWindow(QMainWindow):
                 if mode == "video":
                     if not msg_video:
                         msg_video = msg_audio
-                    out_path = self._embed_video_frames_only(cover_path, msg_video)
+                    job = partial(self._embed_video_frames_only, cover_path, msg_video)
                 elif mode == "audio_track":
                     if not msg_audio:
                         msg_audio = msg_video
-                    out_path = self._embed_video_audio_only(cover_path, msg_audio)
+                    job = partial(self._embed_video_audio_only, cover_path, msg_audio)
                 else:  # both
                     if same_for_both:
                         if not msg_video and msg_audio:
@@ -863,27 +943,43 @@ class MainWindow(QMainWindow):
                         if not msg_audio and msg_video:
                             msg_audio = msg_video
 
-                    out_path = self._embed_video_both_single_file(
-                        cover_path, msg_video, msg_audio
+                    job = partial(
+                        self._embed_video_both_single_file,
+                        cover_path,
+                        msg_video,
+                        msg_audio,
                     )
 
         except Exception as e:
             QMessageBox.critical(self, "Embedding failed", str(e))
             return
 
+        # ffmpeg + NumPy work runs in a worker thread; results come back
+        # to _on_embed_done / _on_embed_failed on the GUI thread.
+        if self.embed_status_label:
+            self.embed_status_label.setText("Embedding...")
+        self._start_task(
+            job, self._on_embed_done, self._on_embed_failed, self.embed_btn
+        )
+
+    def _on_embed_failed(self, error: str) -> None:
+        if self.embed_status_label:
+            self.embed_status_label.setText("")
+        QMessageBox.critical(self, "Embedding failed", error)
+
+    def _on_embed_done(self, out_path: Path) -> None:
         if self.embed_status_label:
+            # green success color comes from QLabel#embed_status_label
             self.embed_status_label.setText(f"Created stego file: {out_path}")
-            # nice green-ish success color
-            self.embed_status_label.setStyleSheet("color: #059669;")
 
 
 
         # Also make it easy to immediately extract from this file
-        self.extract_selected_file = out_path
+        self._select_extract_file(out_path)
         if self.extract_file_label:
             self.extract_file_label.setText(f"Selected: {out_path}")
                     # NEW:
-            self._update_extract_type_label(out_path)
+            self._update_extract_type_label()
 
  # (you might already sync analysis_selected_file here, if not add:)
         self.analysis_selected_file = out_path
@@ -897,7 +993,7 @@ class MainWindow(QMainWindow):
             self.btn_go_to_analysis.setEnabled(True)
 
         # Configure radios on Extract tab for this new stego file
-        self._configure_extract_radios_for_path(out_path)
+        self._configure_extract_radios_for_path()
            
         QMessageBox.information(
             self,
@@ -915,11 +1011,11 @@ class MainWindow(QMainWindow):
             return
 
         # Sync extract state
-        self.extract_selected_file = self.analysis_selected_file
+        self._select_extract_file(self.analysis_selected_file)
         if self.extract_file_label:
             self.extract_file_label.setText(f"Selected: {self.analysis_selected_file}")
-        self._update_extract_type_label(self.analysis_selected_file)
-        self._configure_extract_radios_for_path(self.analysis_selected_file)
+        self._update_extract_type_label()
+        self._configure_extract_radios_for_path()
 
         # Switch tab if available
         if self.tabs is not None and self.extract_tab is not None:
@@ -946,12 +1042,16 @@ class MainWindow(QMainWindow):
 
 
     def _embed_audio_only(self, cover: Path, message: str) -> Path:
+        from core.stego_audio import embed_lsb_audio
+
         out_path = cover.with_name(cover.stem + "_embedded.wav")
         ensure_dir(str(out_path.parent))
         embed_lsb_audio(str(cover), str(out_path), message)
         return out_path
 
     def _embed_video_frames_only(self, cover: Path, message: str) -> Path:
+        from core.stego_video import embed_lsb_video
+
         out_path = cover.with_name(cover.stem + "_embedded_video.avi")
         ensure_dir(str(out_path.parent))
         embed_lsb_video(str(cover), str(out_path), message)
@@ -962,21 +1062,18 @@ class MainWindow(QMainWindow):
         Only modifies the AUDIO track; video frames are kept as-is.
         Output: single video+audio file with stego audio.
         """
-        temp_dir = Path(tempfile.gettempdir()) / "stegdetector_tmp"
-        ensure_dir(str(temp_dir))
-        src_audio = temp_dir / "cover_audio.wav"
-        stego_audio = temp_dir / "cover_audio_stego.wav"
+        from core.stego_audio import embed_lsb_samples
 
-        ok = extract_audio_from_video(str(cover), str(src_audio))
-        if not ok:
+        pcm = self._read_audio_track_pcm(cover)
+        if pcm is None:
             raise RuntimeError("This video has no audio track to hide a message in.")
 
-        embed_lsb_audio(str(src_audio), str(stego_audio), message)
+        embed_lsb_samples(pcm, message)
 
         # Combine original video stream + stego audio into a single container.
         # Use MKV with PCM audio so LSBs are preserved.
         out_path = cover.with_name(cover.stem + "_embedded_audio_only.mkv")
-        self._mux_video_and_audio(cover, stego_audio, out_path)
+        self._mux_video_and_audio(cover, pcm, out_path)
         return out_path
 
     def _embed_video_both_single_file(
@@ -986,58 +1083,132 @@ class MainWindow(QMainWindow):
         Embed one message in VIDEO frames + another in AUDIO track,
         and output ONE video file containing both.
         """
-        temp_dir = Path(tempfile.gettempdir()) / "stegdetector_tmp"
-        ensure_dir(str(temp_dir))
+        from core.stego_audio import embed_lsb_samples
+        from core.stego_video import embed_lsb_video
+
+        temp_dir = self._tmp_dir
 
         # 1) embed into video frames (lossless PNG codec in AVI)
         stego_video = temp_dir / "cover_video_stego.avi"
         embed_lsb_video(str(cover), str(stego_video), msg_video)
 
-        # 2) extract original audio and embed msg_audio
-        src_audio = temp_dir / "cover_audio.wav"
-        stego_audio = temp_dir / "cover_audio_stego.wav"
-        ok = extract_audio_from_video(str(cover), str(src_audio))
-        if not ok:
+        # 2) decode the original audio into memory and embed msg_audio
+        pcm = self._read_audio_track_pcm(cover)
+        if pcm is None:
             raise RuntimeError(
                 "Cover video has no audio track – cannot embed into both video and audio."
             )
-        embed_lsb_audio(str(src_audio), str(stego_audio), msg_audio)
+        embed_lsb_samples(pcm, msg_audio)
 
         # 3) mux stego video + stego audio into a single MKV WITHOUT re-encoding video
         out_path = cover.with_name(cover.stem + "_embedded_both.mkv")
-        self._mux_video_and_audio(stego_video, stego_audio, out_path)
+        self._mux_video_and_audio(stego_video, pcm, out_path)
         return out_path
 
+    def _read_audio_track_pcm(self, video_path: Path | str):
+        """
+        Decode a video's first audio track straight into memory as int16 PCM
+        (interleaved, _TRACK_CHANNELS x _TRACK_SAMPLE_RATE) through an ffmpeg
+        pipe, without writing a WAV. Returns None if there is no audio track.
+        """
+        import numpy as np
+
+        self._require_ffmpeg()
+        cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-nostdin",
+            "-i",
+            str(video_path),
+            "-map",
+            "0:a:0",
+            "-vn",
+            "-ac",
+            str(_TRACK_CHANNELS),
+            "-ar",
+            str(_TRACK_SAMPLE_RATE),
+            "-f",
+            "s16le",
+            "-acodec",
+            "pcm_s16le",
+            "pipe:1",
+        ]
+        with tempfile.TemporaryFile(mode="w+", errors="replace") as log:
+            proc = subprocess.run(
+                cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=log
+            )
+            if proc.returncode != 0:
+                log.seek(0)
+                err = log.read()
+                if "matches no streams" in err:
+                    return None
+                raise RuntimeError(
+                    "ffmpeg failed while decoding the audio track.\n\n"
+                    f"Command: {' '.join(cmd)}\n\n"
+                    f"Error:\n{err}"
+                )
+
+        if not proc.stdout:
+            return None
+        # bytearray -> writable array, embedded into in place
+        return np.frombuffer(bytearray(proc.stdout), dtype="<i2")
+
+    def _require_ffmpeg(self) -> None:
+        from shutil import which
+
+        if which("ffmpeg") is None:
+            raise RuntimeError(
+                "ffmpeg was not found on your system. Please install ffmpeg and "
+                "make sure it is on PATH to create a single video+audio stego file."
+            )
+
     def _mux_video_and_audio(
-        self, video_path: Path | str, audio_path: Path | str, output_path: Path | str
+        self, video_path: Path | str, audio, output_path: Path | str
     ) -> Path:
         """
         Use ffmpeg to combine a video stream and an audio stream into a single file.
+        `audio` is either an audio file path or an int16 PCM array laid out
+        as returned by _read_audio_track_pcm, which is piped to ffmpeg.
 
         - Video is copied (no re-encode) so VIDEO LSB stego survives.
         - Audio is stored as 16-bit PCM so AUDIO LSB stego survives.
         """
-        from shutil import which
-
         video_path = str(video_path)
-        audio_path = str(audio_path)
         output_path = str(output_path)
+        self._require_ffmpeg()
 
-        if which("ffmpeg") is None:
-            raise RuntimeError(
-                "ffmpeg was not found on your system. Please install ffmpeg and "
-                "make sure it is on PATH to create a single video+audio stego file."
-            )
+        if isinstance(audio, (str, Path)):
+            audio_input = ["-i", str(audio)]
+            pcm = None
+        else:
+            audio_input = [
+                "-f",
+                "s16le",
+                "-ar",
+                str(_TRACK_SAMPLE_RATE),
+                "-ac",
+                str(_TRACK_CHANNELS),
+                "-i",
+                "pipe:0",
+            ]
+            pcm = audio
 
         ensure_dir(str(Path(output_path).parent))
 
         cmd = [
             "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-nostdin",
             "-y",
+            "-fflags",
+            "+genpts",
             "-i",
             video_path,
-            "-i",
-            audio_path,
+            *audio_input,
             "-map",
             "0:v:0",
             "-map",
@@ -1049,18 +1220,30 @@ class MainWindow(QMainWindow):
             output_path,
         ]
 
-        proc = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        if proc.returncode != 0:
-            raise RuntimeError(
-                "ffmpeg failed while combining video and audio.\n\n"
-                f"Command: {' '.join(cmd)}\n\n"
-                f"Error:\n{proc.stderr}"
+        # Log to a temp file rather than a pipe: nothing can fill up and
+        # block ffmpeg, and the log is only read back if it failed.
+        with tempfile.TemporaryFile(mode="w+", errors="replace") as log:
+            proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL if pcm is None else subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=log,
             )
+            if pcm is not None:
+                try:
+                    proc.stdin.write(memoryview(pcm).cast("B"))
+                except BrokenPipeError:
+                    pass  # ffmpeg exited early; its log says why
+                finally:
+                    proc.stdin.close()
+            returncode = proc.wait()
+            if returncode != 0:
+                log.seek(0)
+                raise RuntimeError(
+                    "ffmpeg failed while combining video and audio.\n\n"
+                    f"Command: {' '.join(cmd)}\n\n"
+                    f"Error:\n{log.read()}"
+                )
 
         return Path(output_path)
 
@@ -1074,13 +1257,11 @@ class MainWindow(QMainWindow):
         # ------------------------------------------------------------------
     # Helper: show file type on Extract tab
     # ------------------------------------------------------------------
-    def _update_extract_type_label(self, path: Path | str) -> None:
+    def _update_extract_type_label(self) -> None:
         if self.extract_type_label is None:
             return
 
-        p_str = str(path)
-        is_a = is_audio_file(p_str)
-        is_v = is_video_file(p_str)
+        is_a, is_v = self._extract_kind
 
         if is_a and not is_v:
             msg = "Detected as AUDIO file – message will be extracted from audio samples."
@@ -1094,13 +1275,12 @@ class MainWindow(QMainWindow):
 
 
         # ---------- helper used by multiple places ----------
-    def _configure_extract_radios_for_path(self, p: Path | str) -> None:
+    def _configure_extract_radios_for_path(self) -> None:
         """
         Enable/disable extract radio buttons and set the Auto text
-        depending on whether the file is audio-only or video.
+        depending on whether the selected file is audio-only or video.
         """
-        is_a = is_audio_file(str(p))
-        is_v = is_video_file(str(p))
+        is_a, is_v = self._extract_kind
 
         # always default to Auto when a new file is chosen
         if self.extract_mode_auto:
@@ -1145,7 +1325,7 @@ class MainWindow(QMainWindow):
             self,
             "Select stego file",
             "",
-            "Audio/Video (*.wav *.mp3 *.flac *.ogg *.mp4 *.avi *.mkv *.mov);;All files (*)",
+            _AV_FILTER,
         )
         if not path:
             return
@@ -1153,15 +1333,15 @@ class MainWindow(QMainWindow):
         p = Path(path)
 
         # Set extract state + label
-        self.extract_selected_file = p
+        self._select_extract_file(p)
         if self.extract_file_label:
             self.extract_file_label.setText(f"Selected: {p}")
 
         # Show detected type (audio / video) under the file label
-        self._update_extract_type_label(p)
+        self._update_extract_type_label()
 
         # Configure the radio buttons (Auto / Video frames / Audio track)
-        self._configure_extract_radios_for_path(p)
+        self._configure_extract_radios_for_path()
 
         # Sync back to Analysis tab for convenience
         self.analysis_selected_file = p
@@ -1199,8 +1379,7 @@ class MainWindow(QMainWindow):
             return
 
         path = str(self.extract_selected_file)
-        is_a = is_audio_file(path)
-        is_v = is_video_file(path)
+        is_a, is_v = self._extract_kind
         if not is_a and not is_v:
             QMessageBox.warning(
                 self,
@@ -1223,81 +1402,135 @@ class MainWindow(QMainWindow):
         if self.extract_message_view:
             self.extract_message_view.clear()
 
-        try:
-            # ------------------ AUDIO-ONLY FILE ------------------
-            if is_a and not is_v:
-                # For an audio file, whatever the radio, decode audio LSB.
-                msg = extract_lsb_audio(path)
-                if not msg:
-                    msg = (
-                        "[No message detected using 1-LSB extraction. "
-                        "Either there is no hidden ASCII text, or a different stego scheme was used.]"
-                    )
-                if self.extract_message_view:
-                    self.extract_message_view.setPlainText(msg)
-                return
+        # decoding runs in a worker thread; the text comes back to
+        # _show_extracted_text on the GUI thread.
+        self._start_task(
+            partial(self._extract_text, path, is_a and not is_v, mode),
+            self._show_extracted_text,
+            self._on_extract_failed,
+            self.extract_btn,
+        )
 
-            # ------------------ VIDEO FILE -----------------------
-            pieces = []  # list of (label, message)
+    def _extract_text(self, path: str, audio_only: bool, mode: str) -> str:
+        """Decode the message(s) for on_extract_clicked (no widget access)."""
+        from core.stego_audio import extract_lsb_audio
+        from core.stego_video import extract_lsb_video
+
+        # ------------------ AUDIO-ONLY FILE ------------------
+        if audio_only:
+            # For an audio file, whatever the radio, decode audio LSB.
+            msg = extract_lsb_audio(path)
+            if not msg:
+                msg = (
+                    "[No message detected using 1-LSB extraction. "
+                    "Either there is no hidden ASCII text, or a different stego scheme was used.]"
+                )
+            return msg
 
-            if mode == "video":
-                # only video frames
-                v_msg = extract_lsb_video(path)
-                pieces.append(("Video frames", v_msg))
+        # ------------------ VIDEO FILE -----------------------
+        pieces = []  # list of (label, message)
 
-            elif mode == "audio_track":
-                # only audio track
-                a_msg = self._extract_from_video_audio_track(path)
-                pieces.append(("Audio track", a_msg))
+        if mode == "video":
+            # only video frames
+            v_msg = extract_lsb_video(path)
+            pieces.append(("Video frames", v_msg))
 
-            else:
-                # Auto on a video: extract from BOTH frames and audio track
-                v_msg = extract_lsb_video(path)
-                pieces.append(("Video frames", v_msg))
+        elif mode == "audio_track":
+            # only audio track
+            a_msg = self._extract_from_video_audio_track(path)
+            pieces.append(("Audio track", a_msg))
 
-                a_msg = self._extract_from_video_audio_track(path)
-                pieces.append(("Audio track", a_msg))
+        else:
+            # Auto on a video: extract from BOTH frames and audio track
+            v_msg = extract_lsb_video(path)
+            pieces.append(("Video frames", v_msg))
+
+            a_msg = self._extract_from_video_audio_track(path)
+            pieces.append(("Audio track", a_msg))
+
+        # format output nicely
+        if not pieces:
+            return (
+                "[No message detected using 1-LSB extraction. "
+                "Either there is no hidden ASCII text, or a different stego scheme was used.]"
+            )
+        if len(pieces) == 1:
+            # just one message (video-only or audio-only)
+            label, msg = pieces[0]
+            return msg or (
+                "[No message detected using 1-LSB extraction. "
+                "Either there is no hidden ASCII text, or a different stego scheme was used.]"
+            )
 
-            # format output nicely
-            if not pieces:
-                text = (
-                    "[No message detected using 1-LSB extraction. "
-                    "Either there is no hidden ASCII text, or a different stego scheme was used.]"
-                )
-            elif len(pieces) == 1:
-                # just one message (video-only or audio-only)
-                label, msg = pieces[0]
-                text = msg or (
-                    "[No message detected using 1-LSB extraction. "
-                    "Either there is no hidden ASCII text, or a different stego scheme was used.]"
-                )
+        # we have both video and audio messages; written straight
+        # into one buffer so large payloads aren't copied per block
+        buf = io.StringIO()
+        for label, msg in pieces:
+            buf.write(f"=== {label} ===\n")
+            # if msg is empty or whitespace, show a short notice
+            # (isspace() checks it without building a stripped copy)
+            if msg and not msg.isspace():
+                buf.write(msg)
             else:
-                # we have both video and audio messages
-                blocks = []
-                for label, msg in pieces:
-                    blocks.append(f"=== {label} ===")
-                    # if msg is empty or whitespace, show a short notice
-                    msg = msg if msg is not None else ""
-                    blocks.append(msg.strip() or "[No valid LSB text payload found]")
-                    blocks.append("")
-                text = "\n".join(blocks)
-
-            if self.extract_message_view:
-                self.extract_message_view.setPlainText(text)
+                buf.write("[No valid LSB text payload found]")
+            buf.write("\n\n")
+        return buf.getvalue()
 
-        except Exception as e:
-            QMessageBox.critical(self, "Extraction failed", str(e))
-            return
+    def _show_extracted_text(self, text: str) -> None:
+        if self.extract_message_view:
+            view = self.extract_message_view
+            view.setUpdatesEnabled(False)
+            try:
+                view.setPlainText(text)
+            finally:
+                view.setUpdatesEnabled(True)
 
+    def _on_extract_failed(self, error: str) -> None:
+        QMessageBox.critical(self, "Extraction failed", error)
 
+    # ------------------------------------------------------------------
+    # Background tasks (embed / extract)
+    # ------------------------------------------------------------------
+    def _start_task(self, fn, on_done, on_failed, button: QPushButton | None) -> None:
+        """
+        Run `fn` in a QThread (same pattern as the analysis workers) and
+        deliver its result / error to the given slots on the GUI thread.
+        `button` is disabled until the task has finished.
+        """
+        thread = QThread(self)
+        worker = TaskWorker(fn)
+        worker.moveToThread(thread)
+
+        thread.started.connect(worker.run)
+        worker.done.connect(on_done)
+        worker.failed.connect(on_failed)
+        worker.finished.connect(thread.quit)
+        worker.finished.connect(worker.deleteLater)
+        thread.finished.connect(self._on_task_thread_finished)
+        thread.finished.connect(thread.deleteLater)
+
+        self._task_threads.append((thread, worker, button))
+        if button is not None:
+            button.setEnabled(False)
+        thread.start()
+
+    def _on_task_thread_finished(self) -> None:
+        thread = self.sender()
+        remaining = []
+        for t, w, button in self._task_threads:
+            if t is thread:
+                if button is not None:
+                    button.setEnabled(True)
+            else:
+                remaining.append((t, w, button))
+        self._task_threads = remaining
 
     def _extract_from_video_audio_track(self, video_path: str) -> str:
-        temp_dir = Path(tempfile.gettempdir()) / "stegdetector_tmp"
-        ensure_dir(str(temp_dir))
-        tmp_wav = temp_dir / "extracted_audio_for_extract.wav"
+        from core.stego_audio import extract_lsb_audio
 
-        ok = extract_audio_from_video(video_path, str(tmp_wav))
-        if not ok:
-            return "[Video has no audio track to extract from.]"
+        temp_dir = self._tmp_dir
+        tmp_wav = temp_dir / "extracted_audio_for_extract.wav"
 
+        # Raises ValueError when the video has no audio track
+        extract_audio_from_video(video_path, str(tmp_wav))
         return extract_lsb_audio(str(tmp_wav))
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from collections import deque
+from pathlib import Path
+from shutil import which
+from typing import Callable
+import hashlib
+import os
+import re
+import subprocess
+
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from core.utils_av import extract_audio_from_video
+
+# The detector modules (numpy/librosa/sklearn/cv2) are imported inside the
+# job methods so that opening the window does not wait for them.
+
+
+# Job kind -> (section header, label used in the "Best ... method" lines)
+ANALYSIS_JOBS: dict[str, tuple[str, str]] = {
+    "audio": ("=== Audio Analysis ===", "audio"),
+    "audio_track": ("=== Audio Track from Video ===", "audio-track"),
+    "video": ("=== Video Analysis (Frames) ===", "video"),
+}
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_TIME_RE = re.compile(r"time=\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+
+def _hms_to_seconds(match: re.Match) -> float:
+    h, m, s = match.groups()
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+
+def extract_audio_track_ffmpeg(
+    video_path: str,
+    output_wav_path: str,
+    on_progress: Callable[[int], None] | None = None,
+) -> str:
+    """
+    Extract the audio track of a video to 16-bit PCM WAV with an ffmpeg
+    subprocess, reporting 0-100 progress parsed from ffmpeg's stderr.
+
+    Always writes 44.1 kHz stereo, like extract_audio_from_video: MoviePy's
+    audio reader asks ffmpeg for 2 channels whatever the source has, so a
+    mono track is upmixed by both (-ac 2 here) and the samples match.
+    Falls back to it when ffmpeg is not on PATH.
+    """
+    if which("ffmpeg") is None:
+        return extract_audio_from_video(video_path, output_wav_path)
+
+    cmd = [
+        "ffmpeg", "-y", "-nostdin",
+        "-i", str(video_path),
+        "-vn",
+        "-ac", "2",
+        "-ar", "44100",
+        "-acodec", "pcm_s16le",
+        str(output_wav_path),
+    ]
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    )
+
+    duration = None
+    tail: deque[str] = deque(maxlen=20)
+    assert proc.stderr is not None
+    # ffmpeg ends progress lines with '\r'; text mode splits on it too
+    for line in proc.stderr:
+        tail.append(line.rstrip())
+        if duration is None:
+            m = _DURATION_RE.search(line)
+            if m:
+                duration = _hms_to_seconds(m)
+            continue
+        m = _TIME_RE.search(line)
+        if m and duration and on_progress is not None:
+            on_progress(min(100, int(_hms_to_seconds(m) * 100 / duration)))
+    proc.wait()
+
+    if proc.returncode != 0:
+        log = "\n".join(tail)
+        if "does not contain any stream" in log or "matches no streams" in log:
+            raise ValueError("Video has no audio track.")
+        raise RuntimeError(f"ffmpeg failed while extracting the audio track:\n{log}")
+
+    if on_progress is not None:
+        on_progress(100)
+    return str(output_wav_path)
+
+
+class AnalysisWorker(QObject):
+    """
+    Runs the detectors for one file off the GUI thread.
+
+    The worker never touches widgets: detector overviews are sent through
+    `result` and failures through `error`, each as one self-contained block
+    (section header included), so the window can render output from
+    several workers running side by side on the GUI thread.
+
+    Jobs are processed in order:
+      - "audio":       A1/A2 on an audio file
+      - "audio_track": extract the audio track of a video, then A1/A2
+      - "video":       V1/V2 on the frames of a video
+    """
+
+    result = pyqtSignal(str, dict)   # (job kind, overview dict)
+    error = pyqtSignal(str)
+    extract_progress = pyqtSignal(int)   # 0-100 while the audio track is extracted
+    # ((video path, mtime, size), WAV path) of a newly extracted audio track,
+    # for the window to add to its cache on the GUI thread; None otherwise
+    finished = pyqtSignal(object)
+
+    def __init__(
+        self,
+        path: str,
+        jobs: list[str],
+        tmp_dir: Path,
+        wav_cache: dict[tuple[str, float, int], Path],
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self.jobs = list(jobs)
+        self.tmp_dir = tmp_dir
+        # Snapshot of the window's (video path, mtime, size) -> extracted WAV,
+        # taken on the GUI thread; only ever read here
+        self.wav_cache = dict(wav_cache)
+        self._extracted: tuple[tuple[str, float, int], Path] | None = None
+
+    @pyqtSlot()
+    def run(self) -> None:
+        try:
+            for kind in self.jobs:
+                self._run_job(kind)
+        finally:
+            self.finished.emit(self._extracted)
+
+    def _run_job(self, kind: str) -> None:
+        header = ANALYSIS_JOBS[kind][0]
+
+        if kind == "video":
+            from core.video_detector import analyze_video as analyze
+            target, what = self.path, "video"
+        else:
+            from core.audio_detector import analyze_audio as analyze
+            target, what = self.path, "audio"
+            if kind == "audio_track":
+                what = "audio track"
+                try:
+                    target = str(self._audio_track_wav())
+                except Exception as e:
+                    self.error.emit(f"{header}\nCould not extract audio track: {e}\n")
+                    return
+
+        try:
+            res = analyze(target)
+        except Exception as e:
+            self.error.emit(f"{header}\nError during {what} analysis: {e}\n")
+            return
+        self.result.emit(kind, res)
+
+    def _audio_track_wav(self) -> Path:
+        """
+        Return a WAV of the video's audio track, re-using the one extracted
+        earlier for the same (path, mtime, size) instead of running ffmpeg again.
+        """
+        st = os.stat(self.path)
+        key = (self.path, st.st_mtime, st.st_size)
+        cached = self.wav_cache.get(key)
+        if cached is not None and cached.exists():
+            return cached
+
+        # Stable across runs, unlike the per-process salted hash()
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+        tmp_wav = self.tmp_dir / f"extracted_{digest}.wav"
+        self.extract_progress.emit(0)
+        extract_audio_track_ffmpeg(
+            self.path, str(tmp_wav), self.extract_progress.emit
+        )
+
+        self._extracted = (key, tmp_wav)
+        return tmp_wav
+
+
+class TaskWorker(QObject):
+    """
+    Runs one blocking call (an embed or an extract) off the GUI thread.
+
+    `fn` must not touch widgets; its return value is delivered through
+    `done` and any exception message through `failed`.
+    """
+
+    done = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    def __init__(self, fn: Callable[[], object]) -> None:
+        super().__init__()
+        self.fn = fn
+
+    @pyqtSlot()
+    def run(self) -> None:
+        try:
+            self.done.emit(self.fn())
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self.finished.emit()
@@ -1,35 +1,59 @@
 # auth_db.py
+import os
 import sqlite3
+import threading
 import bcrypt
-import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple
 
 DB_PATH = Path(__file__).resolve().parent / "users.db"
 
+# bcrypt work factor for new hashes. 10 keeps login fast for this local,
+# single-user database. Existing hashes keep the cost they were created with.
+BCRYPT_COST = int(os.environ.get("STEGDET_BCRYPT_COST", "10"))
 
-def get_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+
+# One connection for the whole process: Streamlit runs each session in its
+# own thread, so it is opened with check_same_thread=False and every use
+# holds _LOCK.
+_CONN: Optional[sqlite3.Connection] = None
+_LOCK = threading.Lock()
+_DB_READY = False
+
+
+def get_connection() -> sqlite3.Connection:
+    """Return the shared connection, opening it on first use."""
+    global _CONN
+    if _CONN is None:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _CONN = conn
+    return _CONN
 
 
 def init_db():
-    """Create users table if it doesn't exist."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password_hash BLOB NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """
-    )
-    conn.commit()
-    conn.close()
+    """Create users table if it doesn't exist (once per process)."""
+    global _DB_READY
+    with _LOCK:
+        if _DB_READY:
+            return
+        conn = get_connection()
+        # The UNIQUE constraint already gives `username` an index.
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE NOT NULL,
+                password_hash BLOB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            """
+        )
+        conn.commit()
+        _DB_READY = True
 
 
 def is_strong_password(password: str) -> Tuple[bool, str]:
@@ -43,13 +67,26 @@ def is_strong_password(password: str) -> Tuple[bool, str]:
     """
     if len(password) < 8:
         return False, "Password must be at least 8 characters long."
-    if not re.search(r"[a-z]", password):
+
+    # One pass over the password; same classes as [a-z], [A-Z], \d, [^\w\s]
+    has_lower = has_upper = has_digit = has_special = False
+    for ch in password:
+        if "a" <= ch <= "z":
+            has_lower = True
+        elif "A" <= ch <= "Z":
+            has_upper = True
+        elif ch.isdecimal():
+            has_digit = True
+        elif not (ch.isalnum() or ch == "_" or ch.isspace()):
+            has_special = True
+
+    if not has_lower:
         return False, "Password must contain at least one lowercase letter."
-    if not re.search(r"[A-Z]", password):
+    if not has_upper:
         return False, "Password must contain at least one uppercase letter."
-    if not re.search(r"\d", password):
+    if not has_digit:
         return False, "Password must contain at least one digit."
-    if not re.search(r"[^\w\s]", password):
+    if not has_special:
         return False, "Password must contain at least one special character (e.g. !@#$%)."
     return True, ""
 
@@ -64,32 +101,37 @@ def create_user(username: str, password: str) -> Tuple[bool, str]:
         return False, msg
 
     password_bytes = password.encode("utf-8")
-    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
-
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "INSERT INTO users (username, password_hash) VALUES (?, ?)",
-            (username, hashed),
-        )
-        conn.commit()
-    except sqlite3.IntegrityError:
-        conn.close()
-        return False, "Username already exists."
-    conn.close()
+    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=BCRYPT_COST))
+
+    with _LOCK:
+        conn = get_connection()
+        try:
+            conn.execute(
+                "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+                (username, hashed),
+            )
+            conn.commit()
+        except sqlite3.IntegrityError:
+            conn.rollback()
+            return False, "Username already exists."
     return True, "Account created successfully."
 
 
+@lru_cache(maxsize=1)
+def _dummy_hash() -> bytes:
+    """Hash checked for unknown usernames, so they take as long as real ones."""
+    return bcrypt.hashpw(b"dummy-password", bcrypt.gensalt(rounds=BCRYPT_COST))
+
+
 def verify_user(username: str, password: str) -> bool:
     """Return True if username/password combination is valid."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT password_hash FROM users WHERE username = ?", (username,))
-    row = cur.fetchone()
-    conn.close()
+    with _LOCK:
+        row = get_connection().execute(
+            "SELECT password_hash FROM users WHERE username = ?", (username,)
+        ).fetchone()
 
     if row is None:
+        bcrypt.checkpw(password.encode("utf-8"), _dummy_hash())
         return False
 
     stored_hash = row["password_hash"]
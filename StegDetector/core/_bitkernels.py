@@ -0,0 +1,43 @@
+# core/_bitkernels.py
+"""
+Optional numba kernels for the LSB embed/extract loops.
+
+numba is not a hard dependency: without it `numba`, `apply_lsb` and
+`extract_lsb` are None and callers use their NumPy paths instead. Other
+modules take `numba` from here so the threading-layer choice below
+applies to all of their kernels.
+"""
+from __future__ import annotations
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+if numba is not None:
+    # Must be set before the first parallel kernel runs. numba picks TBB
+    # first when it is installed, and its worker pool can hang interpreter
+    # exit once imageio's ffmpeg reader has been used. workqueue goes
+    # last: it aborts on concurrent callers (the GUI runs analyses side by side).
+    numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True, boundscheck=False, fastmath=False)
+    def apply_lsb(flat_u8, bits_u8, n):
+        """Set the LSB of flat_u8[i] to bits_u8[i] for i < n, in place."""
+        for i in numba.prange(n):
+            flat_u8[i] = (flat_u8[i] & 0xFE) | bits_u8[i]
+
+    @numba.njit(parallel=True, cache=True, boundscheck=False, fastmath=False)
+    def extract_lsb(flat_u8, out, n):
+        """out[i] = LSB of flat_u8[i] for i < n."""
+        for i in numba.prange(n):
+            out[i] = flat_u8[i] & 1
+
+    # Compiled on first call, not at import: importing core.stego_audio
+    # (e.g. for an extract) stays cheap, and cache=True lets later
+    # processes load the compiled kernels from __pycache__.
+else:
+    apply_lsb = None
+    extract_lsb = None
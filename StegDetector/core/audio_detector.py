@@ -1,5 +1,10 @@
+from collections import OrderedDict
+from copy import deepcopy
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional, Tuple
+import sys
+import threading
 
 import numpy as np
 import librosa
@@ -9,6 +14,8 @@ from sklearn.svm import SVC
 import joblib
 import os
 
+from ._bitkernels import numba  # optional (None): JIT-compiled LSB counter
+
 
 MODELS_DIR = Path("models")
 AUDIO_SCALER_PATH = MODELS_DIR / "audio_scaler.joblib"
@@ -19,14 +26,66 @@ AUDIO_SVM_PATH = MODELS_DIR / "audio_svm.joblib"
 # A1: LSB Statistical Audio Detector
 # ========================
 
-def _load_audio_pcm16(path: str) -> np.ndarray:
+_PCM_BLOCK_FRAMES = 1 << 20
+
+
+def _iter_audio_pcm16_blocks(path: str) -> Iterator[np.ndarray]:
+    """
+    Yield the audio as 16-bit PCM samples (mono), one block at a time, so
+    memory use doesn't grow with the file length.
+
+    Reads the samples as int16 with soundfile, so the stored LSBs are seen
+    as-is (no float round trip, no resampling). Multi-channel audio is
+    averaged with integer math. Formats soundfile can't decode fall back
+    to librosa (whole file at once).
     """
-    Load audio as 16-bit PCM samples (mono).
+    try:
+        f = sf.SoundFile(path)
+    except Exception:
+        y, _ = librosa.load(path, sr=None, mono=True)
+        # Scale float [-1, 1] to int16
+        yield np.clip(y * 32767.0, -32768, 32767).astype(np.int16)
+        return
+
+    with f:
+        for data in f.blocks(
+            blocksize=_PCM_BLOCK_FRAMES, dtype="int16", always_2d=True
+        ):
+            if data.shape[1] == 1:
+                yield data[:, 0]
+            else:
+                yield (
+                    data.sum(axis=1, dtype=np.int32) // data.shape[1]
+                ).astype(np.int16)
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True, boundscheck=False)
+    def _count_lsb_ones_jit(pcm):
+        s = 0
+        for i in numba.prange(pcm.size):
+            s += pcm[i] & 1
+        return s
+
+    # compile now rather than on the first analysis
+    _count_lsb_ones_jit(np.zeros(1, dtype=np.int16))
+else:
+    _count_lsb_ones_jit = None
+
+
+def _count_lsb_ones(pcm: np.ndarray) -> int:
     """
-    y, sr = librosa.load(path, sr=None, mono=True)
-    # Scale float [-1, 1] to int16
-    pcm = np.clip(y * 32767.0, -32768, 32767).astype(np.int16)
-    return pcm
+    Number of int16 samples whose least significant bit is 1.
+
+    With numba this is a single parallel pass over the samples. Otherwise,
+    only the low byte of each sample carries the LSB, so work on a strided
+    uint8 view of it: one byte per sample instead of an int16 `pcm & 1` copy.
+    """
+    pcm = np.ascontiguousarray(pcm, dtype=np.int16)  # native byte order
+    if _count_lsb_ones_jit is not None:
+        return int(_count_lsb_ones_jit(pcm))
+    low = pcm.view(np.uint8)[0 if sys.byteorder == "little" else 1::2]
+    return int(np.count_nonzero(low & 1))
 
 
 def audio_lsb_statistics(path: str) -> Dict[str, Any]:
@@ -38,19 +97,21 @@ def audio_lsb_statistics(path: str) -> Dict[str, Any]:
     Strongly stego-modified audio often pushes distribution closer to 0.5.
     We treat "too close to 0.5" as suspicious.
     """
-    pcm = _load_audio_pcm16(path)
-    if pcm.size == 0:
+    ones = 0
+    n = 0
+    for pcm in _iter_audio_pcm16_blocks(path):
+        ones += _count_lsb_ones(pcm)
+        n += pcm.size
+
+    if n == 0:
         return {
             "method": "A1_LSB_stats",
             "score": 0.0,
             "verdict": "Audio too short / invalid"
         }
 
-    lsb = pcm & 1
-    ones = np.count_nonzero(lsb)
-    zeros = lsb.size - ones
-    p1 = ones / float(lsb.size)
-    p0 = zeros / float(lsb.size)
+    p1 = ones / float(n)
+    p0 = 1.0 - p1
 
     # Suspicion: 1 when perfectly balanced (0.5 / 0.5), 0 when fully skewed.
     balance = 1.0 - abs(p1 - 0.5) * 2.0  # in [0,1]
@@ -76,28 +137,59 @@ def audio_lsb_statistics(path: str) -> Dict[str, Any]:
 # A2: MFCC + SVM (Best Audio Method)
 # ========================
 
+# STFT / frame parameters of the trained A2 model (librosa's defaults).
+_N_FFT = 2048
+_HOP_LENGTH = 512
+
+
+def _load_mono_float(path: str, sr: int) -> np.ndarray:
+    """
+    Mono float32 samples at `sr`, like librosa.load(path, sr=sr, mono=True).
+    Files already at `sr` are read straight with soundfile, skipping
+    librosa's loader and resampler.
+    """
+    try:
+        native_sr = sf.info(path).samplerate
+    except Exception:
+        native_sr = None
+
+    if native_sr == sr:
+        y, _ = sf.read(path, dtype="float32", always_2d=True)
+        return y.mean(axis=1) if y.shape[1] > 1 else y[:, 0]
+
+    y, _ = librosa.load(path, sr=sr, mono=True, res_type="soxr_hq")
+    return y
+
+
 def extract_audio_features(path: str, sr: int = 16000) -> np.ndarray:
     """
     Extract MFCC + basic spectral features from an audio file.
     This must match the features used during training.
     """
-    y, _ = librosa.load(path, sr=sr, mono=True)
+    y = _load_mono_float(path, sr)
     if y.size == 0:
         raise ValueError("Empty audio signal.")
 
     # Trim or pad to reasonable length (optional)
     # Here we just keep as-is.
 
+    # One STFT shared by every spectral feature (librosa's defaults, so the
+    # values are identical to computing each feature from `y`).
+    S_mag = np.abs(librosa.stft(y, n_fft=_N_FFT, hop_length=_HOP_LENGTH))
+
     # MFCCs
-    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+    mel_db = librosa.power_to_db(librosa.feature.melspectrogram(S=S_mag ** 2, sr=sr))
+    mfcc = librosa.feature.mfcc(S=mel_db, n_mfcc=13)
     mfcc_mean = mfcc.mean(axis=1)
     mfcc_std = mfcc.std(axis=1)
 
     # Spectral features
-    spec_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)
-    spec_bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=sr)
-    spec_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)
-    zcr = librosa.feature.zero_crossing_rate(y)
+    spec_centroid = librosa.feature.spectral_centroid(S=S_mag, sr=sr)
+    spec_bandwidth = librosa.feature.spectral_bandwidth(S=S_mag, sr=sr)
+    spec_rolloff = librosa.feature.spectral_rolloff(S=S_mag, sr=sr)
+    zcr = librosa.feature.zero_crossing_rate(
+        y, frame_length=_N_FFT, hop_length=_HOP_LENGTH
+    )
 
     features = np.concatenate([
         mfcc_mean,
@@ -111,24 +203,71 @@ def extract_audio_features(path: str, sr: int = 16000) -> np.ndarray:
     return features.astype(np.float32)
 
 
+@lru_cache(maxsize=1)
+def _load_audio_models_cached(
+    scaler_mtime_ns: int, svm_mtime_ns: int
+) -> Tuple[StandardScaler, SVC]:
+    return joblib.load(AUDIO_SCALER_PATH), joblib.load(AUDIO_SVM_PATH)
+
+
+def _audio_model_mtimes() -> Optional[Tuple[int, int]]:
+    """mtimes of the A2 scaler and SVM, or None when either is missing."""
+    try:
+        return (
+            AUDIO_SCALER_PATH.stat().st_mtime_ns,
+            AUDIO_SVM_PATH.stat().st_mtime_ns,
+        )
+    except FileNotFoundError:
+        return None
+
+
+def _load_audio_models() -> Optional[Tuple[StandardScaler, SVC]]:
+    """
+    Load the A2 scaler and SVM once and keep them in memory.
+    The cache is keyed on the files' mtimes, so retrained models are picked up.
+    Returns None when the models have not been trained yet.
+    """
+    mtimes = _audio_model_mtimes()
+    if mtimes is None:
+        return None
+    return _load_audio_models_cached(*mtimes)
+
+
+def _stego_probability(clf, feats_scaled: np.ndarray) -> float:
+    """
+    Probability of the stego class for one scaled feature row.
+
+    Works with the RBF SVC from training (Platt-scaled predict_proba) as well
+    as linear models: LogisticRegression via predict_proba, LinearSVC (no
+    predict_proba) via a logistic of its single-dot-product decision_function.
+    """
+    if hasattr(clf, "predict_proba"):
+        return float(clf.predict_proba(feats_scaled)[0, 1])
+    margin = float(clf.decision_function(feats_scaled)[0])
+    return float(1.0 / (1.0 + np.exp(-margin)))
+
+
+_A2_NOT_TRAINED = {
+    "method": "A2_MFCC_SVM",
+    "score": None,
+    "verdict": "Model not trained yet. Run training/train_audio_svm.py.",
+}
+
+
 def audio_mfcc_svm(path: str) -> Dict[str, Any]:
     """
     Run MFCC+SVM model on audio.
     Requires that training/train_audio_svm.py was executed to create model files.
     """
-    if not AUDIO_SCALER_PATH.exists() or not AUDIO_SVM_PATH.exists():
-        return {
-            "method": "A2_MFCC_SVM",
-            "score": None,
-            "verdict": "Model not trained yet. Run training/train_audio_svm.py.",
-        }
-
-    scaler: StandardScaler = joblib.load(AUDIO_SCALER_PATH)
-    clf: SVC = joblib.load(AUDIO_SVM_PATH)
+    models = _load_audio_models()
+    if models is None:
+        # No model: skip feature extraction entirely
+        return dict(_A2_NOT_TRAINED)
+    scaler, clf = models
 
     feats = extract_audio_features(path)
     feats_scaled = scaler.transform([feats])
-    proba = clf.predict_proba(feats_scaled)[0, 1]  # probability of stego class
+    proba = _stego_probability(clf, feats_scaled)
 
     if proba < 0.3:
         verdict = "Likely clean"
@@ -144,11 +283,40 @@ def audio_mfcc_svm(path: str) -> Dict[str, Any]:
     }
 
 
+# analyze_audio results keyed by (path, mtime_ns, size, model mtimes):
+# re-analyzing an unchanged file is free, while re-embedding into it or
+# training/retraining the A2 model changes the key.
+_ANALYSIS_CACHE_SIZE = 32
+_analysis_cache: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+
 def analyze_audio(path: str) -> Dict[str, Any]:
     """
     Run all audio detectors and return a combined result.
+    Results are cached per (path, mtime, size) and A2 model version.
     """
     path = str(path)
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size, _audio_model_mtimes())
+
+    with _analysis_cache_lock:
+        cached = _analysis_cache.get(key)
+        if cached is not None:
+            _analysis_cache.move_to_end(key)
+            return deepcopy(cached)
+
+    overview = _analyze_audio_uncached(path)
+
+    with _analysis_cache_lock:
+        _analysis_cache[key] = deepcopy(overview)
+        _analysis_cache.move_to_end(key)
+        while len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    return overview
+
+
+def _analyze_audio_uncached(path: str) -> Dict[str, Any]:
     results = []
 
     # A1 always available
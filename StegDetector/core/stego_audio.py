@@ -3,12 +3,18 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import Union
+import sys
 
 import numpy as np
 import soundfile as sf
 
+from core._bitkernels import apply_lsb, extract_lsb
+
 PathLike = Union[str, Path]
 
+HEADER_BITS = 32  # 4-byte big-endian length, one bit per sample
+MAX_PAYLOAD_BYTES = 100_000  # longer headers are treated as "no payload"
+
 
 def _encode_message_to_bits(message: str) -> np.ndarray:
     """
@@ -21,25 +27,27 @@ def _encode_message_to_bits(message: str) -> np.ndarray:
     header = length.to_bytes(4, byteorder="big")
     payload = header + msg_bytes
 
-    bit_str = "".join(f"{b:08b}" for b in payload)
-    bits = np.fromiter((int(ch) for ch in bit_str), dtype=np.uint8)
-    return bits
+    return np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+
 
+def _bits_to_length(header_bits: np.ndarray) -> int:
+    """32 header bits (MSB first) -> the big-endian payload length."""
+    return int.from_bytes(np.packbits(header_bits).tobytes(), byteorder="big")
 
-def _decode_bits_to_message(bits: np.ndarray, max_len_bytes: int = 100_000) -> str | None:
+
+def _decode_bits_to_message(
+    bits: np.ndarray, max_len_bytes: int = MAX_PAYLOAD_BYTES
+) -> str | None:
     """
     Inverse of _encode_message_to_bits.
     Returns None if header looks impossible or message is empty.
     """
-    bits = bits.astype(np.uint8).flatten()
+    bits = np.asarray(bits, dtype=np.uint8).reshape(-1)
     if bits.size < 32:
         return None
 
     # First 32 bits -> 4-byte length
-    length_bits = bits[:32]
-    length_val = 0
-    for b in length_bits:
-        length_val = (length_val << 1) | int(b)
+    length_val = _bits_to_length(bits[:32])
 
     # Sanity checks
     max_possible = (bits.size - 32) // 8
@@ -50,16 +58,10 @@ def _decode_bits_to_message(bits: np.ndarray, max_len_bytes: int = 100_000) -> s
     if bits.size < needed:
         return None
 
-    msg_bits = bits[32:needed].reshape(-1, 8)
-    byte_vals = []
-    for byte in msg_bits:
-        val = 0
-        for b in byte:
-            val = (val << 1) | int(b)
-        byte_vals.append(val)
+    msg_bytes = np.packbits(bits[32:needed]).tobytes()
 
     try:
-        msg = bytes(byte_vals).decode("utf-8", errors="replace")
+        msg = msg_bytes.decode("utf-8", errors="replace")
     except Exception:
         return None
 
@@ -68,6 +70,35 @@ def _decode_bits_to_message(bits: np.ndarray, max_len_bytes: int = 100_000) -> s
     return msg
 
 
+def _low_bytes(flat: np.ndarray) -> np.ndarray:
+    """Strided uint8 view of the low (LSB-carrying) byte of each int16 sample."""
+    low_start = 0 if sys.byteorder == "little" else 1
+    return flat.view(np.uint8)[low_start::2]
+
+
+def _payload_span(low: np.ndarray) -> int:
+    """
+    Number of leading samples an LSB payload spans (header + message),
+    read from the length header in the low bytes `low`. An implausible
+    length gives HEADER_BITS, since nothing past it can decode.
+    """
+    if low.size < HEADER_BITS:
+        return low.size
+    length = _bits_to_length(low[:HEADER_BITS] & 1)
+    if not 0 < length <= MAX_PAYLOAD_BYTES:
+        return HEADER_BITS
+    return HEADER_BITS + length * 8
+
+
+def payload_sample_count(header_samples: np.ndarray) -> int:
+    """
+    Given the first HEADER_BITS int16 samples (memory order), return how
+    many leading samples are needed to extract the payload they announce.
+    """
+    flat = np.ascontiguousarray(header_samples, dtype=np.int16).reshape(-1)
+    return _payload_span(_low_bytes(flat))
+
+
 def _load_audio_int16(path: PathLike) -> tuple[np.ndarray, int]:
     """
     Load audio directly as int16 PCM.
@@ -87,6 +118,40 @@ def _save_audio_int16(path: PathLike, int_data: np.ndarray, sr: int) -> None:
     sf.write(str(path), int_data, sr, subtype="PCM_16")
 
 
+def embed_lsb_samples(samples: np.ndarray, message: str) -> np.ndarray:
+    """
+    Embed a UTF-8 text message into the LSBs of int16 PCM samples, in place
+    (for C-contiguous arrays; anything else is copied first).
+    Samples are used in memory order (interleaved for multi-channel audio),
+    the same layout embed_lsb_audio uses for WAV files.
+    Returns the modified array.
+    """
+    bits = _encode_message_to_bits(message)
+    capacity = samples.size
+
+    if bits.size > capacity:
+        raise ValueError(
+            f"Message too long for this audio. "
+            f"Capacity bits = {capacity}, needed = {bits.size}"
+        )
+
+    if not samples.flags.c_contiguous:
+        samples = np.ascontiguousarray(samples)
+    flat = samples.reshape(-1)
+
+    if apply_lsb is not None:
+        # One parallel pass over the low byte of each sample
+        apply_lsb(_low_bytes(flat), bits, bits.size)
+        return samples
+
+    # Clear + set LSBs of the first bits.size samples, in int16 and in place
+    # (& ~1 / | 0-1 can't overflow, so no wider working copy is needed).
+    head = flat[:bits.size]
+    np.bitwise_and(head, np.int16(~1), out=head)
+    np.bitwise_or(head, bits, out=head, casting="unsafe")
+    return samples
+
+
 def embed_lsb_audio(cover_path: PathLike, stego_path: PathLike, message: str) -> None:
     """
     Embed a UTF-8 text message into the LSBs of an audio file.
@@ -99,37 +164,39 @@ def embed_lsb_audio(cover_path: PathLike, stego_path: PathLike, message: str) ->
     stego_path.parent.mkdir(parents=True, exist_ok=True)
 
     int_data, sr = _load_audio_int16(cover_path)
-    shape = int_data.shape  # (samples, channels)
-
-    # Work in int32 to avoid any overflow issues with bitwise ops
-    flat32 = int_data.reshape(-1).astype(np.int32)
-
-    bits = _encode_message_to_bits(message).astype(np.int32)
-    capacity = flat32.size
-
-    if bits.size > capacity:
-        raise ValueError(
-            f"Message too long for this audio. "
-            f"Capacity bits = {capacity}, needed = {bits.size}"
-        )
-
-    # Clear + set LSBs in the first bits.size samples
-    flat32[:bits.size] = (flat32[:bits.size] & ~1) | bits
-
-    stego_int16 = flat32.reshape(shape).astype(np.int16)
+    stego_int16 = embed_lsb_samples(int_data, message)
     _save_audio_int16(stego_path, stego_int16, sr)
 
 
-def extract_lsb_audio(stego_path: PathLike) -> str:
+def extract_lsb_samples(samples: np.ndarray) -> str:
     """
-    Try to extract a message from LSBs of an audio file created by embed_lsb_audio.
+    Extract a message from the LSBs of int16 PCM samples (memory order),
+    the inverse of embed_lsb_samples. The samples only need to cover the
+    payload_sample_count() leading samples; extra ones are ignored.
     If no plausible header is found, returns a friendly message instead of garbage.
     """
-    int_data, sr = _load_audio_int16(stego_path)
-    flat32 = int_data.reshape(-1).astype(np.int32)
-    bits = (flat32 & 1).astype(np.uint8)
+    # LSBs live in each sample's low byte: AND a strided uint8 view of it
+    # instead of making int16 temporaries
+    low = _low_bytes(np.ascontiguousarray(samples, dtype=np.int16).reshape(-1))
+
+    # Read the length header first and only take the LSBs the payload needs
+    needed = min(low.size, _payload_span(low))
+    if extract_lsb is not None:
+        bits = np.empty(needed, dtype=np.uint8)
+        extract_lsb(low, bits, needed)
+    else:
+        bits = low[:needed] & 1
 
     msg = _decode_bits_to_message(bits)
     if msg is None:
         return "[No valid LSB text payload found in this audio file]"
     return msg
+
+
+def extract_lsb_audio(stego_path: PathLike) -> str:
+    """
+    Try to extract a message from LSBs of an audio file created by embed_lsb_audio.
+    If no plausible header is found, returns a friendly message instead of garbage.
+    """
+    int_data, sr = _load_audio_int16(stego_path)
+    return extract_lsb_samples(int_data)
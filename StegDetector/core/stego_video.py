@@ -10,6 +10,7 @@ import imageio.v2 as imageio
 PathLike = Union[str, Path]
 
 HEADER_BYTES = 4  # store length as 32-bit big-endian
+MAX_PAYLOAD_BYTES = 200_000  # longer headers are treated as "no payload"
 
 
 def _encode_message_to_bits(message: str) -> np.ndarray:
@@ -22,29 +23,25 @@ def _encode_message_to_bits(message: str) -> np.ndarray:
     header = length.to_bytes(HEADER_BYTES, byteorder="big")
     payload = header + msg_bytes
 
-    bit_list = []
-    for b in payload:
-        for i in range(7, -1, -1):
-            bit_list.append((b >> i) & 1)
+    # MSB-first, same order as the old per-bit loop
+    return np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
 
-    bits = np.array(bit_list, dtype=np.uint8)
-    return bits
 
-
-def _decode_bits_to_message(bits: np.ndarray, max_len_bytes: int = 200_000) -> str | None:
+def _decode_bits_to_message(
+    bits: np.ndarray, max_len_bytes: int = MAX_PAYLOAD_BYTES
+) -> str | None:
     """
     Inverse of _encode_message_to_bits.
     Returns None if header looks impossible or message is empty.
     """
-    bits = bits.astype(np.uint8).flatten()
+    bits = np.asarray(bits, dtype=np.uint8).reshape(-1)
     if bits.size < HEADER_BYTES * 8:
         return None
 
     # First 32 bits -> 4-byte length
-    length_bits = bits[: HEADER_BYTES * 8]
-    length_val = 0
-    for b in length_bits:
-        length_val = (length_val << 1) | int(b)
+    length_val = int.from_bytes(
+        np.packbits(bits[: HEADER_BYTES * 8]).tobytes(), byteorder="big"
+    )
 
     max_possible = (bits.size - HEADER_BYTES * 8) // 8
     if length_val <= 0 or length_val > max_possible or length_val > max_len_bytes:
@@ -54,16 +51,10 @@ def _decode_bits_to_message(bits: np.ndarray, max_len_bytes: int = 200_000) -> s
     if bits.size < needed:
         return None
 
-    msg_bits = bits[HEADER_BYTES * 8 : needed].reshape(-1, 8)
-    byte_vals: List[int] = []
-    for byte in msg_bits:
-        val = 0
-        for b in byte:
-            val = (val << 1) | int(b)
-        byte_vals.append(val)
+    msg_bytes = np.packbits(bits[HEADER_BYTES * 8 : needed]).tobytes()
 
     try:
-        msg = bytes(byte_vals).decode("utf-8", errors="replace")
+        msg = msg_bytes.decode("utf-8", errors="replace")
     except Exception:
         return None
 
@@ -72,17 +63,34 @@ def _decode_bits_to_message(bits: np.ndarray, max_len_bytes: int = 200_000) -> s
     return msg
 
 
+def _read_frame(stream, buf: np.ndarray) -> bool:
+    """
+    Fill `buf` with the next raw frame from `stream`.
+    Returns False at end of stream (a trailing partial frame is dropped).
+    """
+    view = memoryview(buf).cast("B")
+    got = 0
+    while got < len(view):
+        n = stream.readinto(view[got:])
+        if not n:
+            return False
+        got += n
+    return True
+
+
 def embed_lsb_video(cover_path: PathLike, stego_path: PathLike, message: str) -> None:
     """
     Embed a UTF-8 text message into the LSBs of a video.
 
-    Uses ffmpeg to work directly with video frames without color space conversion.
+    Frames are decoded by one ffmpeg process to raw rgb24 on a pipe, the
+    LSBs are set in place, and the frames are piped to a second ffmpeg
+    that encodes them losslessly with FFV1. Nothing is written to disk
+    except the output video.
     """
-    from shutil import which
+    from shutil import which, copyfileobj
     import subprocess
     import tempfile
-    import shutil
-    
+
     cover_path = Path(cover_path)
     stego_path = Path(stego_path)
     stego_path.parent.mkdir(parents=True, exist_ok=True)
@@ -94,87 +102,89 @@ def embed_lsb_video(cover_path: PathLike, stego_path: PathLike, message: str) ->
     reader = imageio.get_reader(str(cover_path))
     meta = reader.get_meta_data()
     fps = meta.get("fps", 25)
+    width, height = meta["size"]
     reader.close()
 
-    # Create temp directory for frame files
-    temp_dir = Path(tempfile.gettempdir()) / "steg_video_frames"
-    if temp_dir.exists():
-        shutil.rmtree(temp_dir)
-    temp_dir.mkdir(parents=True, exist_ok=True)
-
-    try:
-        # Extract frames using ffmpeg (preserves YUV colorspace)
-        frame_pattern = str(temp_dir / "frame_%06d.png")
-        extract_cmd = [
-            "ffmpeg", "-i", str(cover_path),
-            "-pix_fmt", "rgb24",  # Convert to RGB for LSB embedding
-            frame_pattern
-        ]
-        
-        result = subprocess.run(extract_cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise RuntimeError(f"ffmpeg extraction failed: {result.stderr}")
-
-        # Get all frame files
-        frame_files = sorted(temp_dir.glob("frame_*.png"))
-        if not frame_files:
+    per = width * height * 3  # bytes per rgb24 frame
+    bits = _encode_message_to_bits(message)
+
+    # Only errors are logged: no banner or per-frame progress lines
+    quiet = ["-hide_banner", "-loglevel", "error", "-nostats"]
+    decode_cmd = [
+        "ffmpeg", *quiet, "-nostdin", "-i", str(cover_path),
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",  # Convert to RGB for LSB embedding
+        "-",
+    ]
+    encode_cmd = [
+        "ffmpeg", *quiet, "-y", "-nostdin",
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-s", f"{width}x{height}",
+        "-framerate", str(fps),
+        "-i", "-",
+        "-c:v", "ffv1",
+        "-level", "3",
+        str(stego_path),
+    ]
+
+    # Both logs go to temp files so a full stderr pipe can never stall
+    # the frame pipes; they are only read back on failure.
+    with tempfile.TemporaryFile(mode="w+", errors="replace") as dec_log, \
+            tempfile.TemporaryFile(mode="w+", errors="replace") as enc_log:
+        dec = subprocess.Popen(
+            decode_cmd, stdout=subprocess.PIPE, stderr=dec_log
+        )
+        enc = subprocess.Popen(
+            encode_cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=enc_log,
+        )
+
+        frame = np.empty(per, dtype=np.uint8)
+        pos = 0
+        capacity = 0
+        ok = False
+        try:
+            # Only the frames that carry payload bits go through NumPy
+            while pos < bits.size and _read_frame(dec.stdout, frame):
+                capacity += per
+                n = min(per, bits.size - pos)
+                head = frame[:n]
+                frame[:n] = (head & np.uint8(0xFE)) | bits[pos : pos + n]
+                pos += n
+                enc.stdin.write(memoryview(frame))
+
+            # The rest of the video is passed through untouched
+            if pos >= bits.size:
+                copyfileobj(dec.stdout, enc.stdin, 1 << 20)
+            ok = True
+        except BrokenPipeError:
+            pass  # the encoder exited early; its log says why
+        finally:
+            enc.stdin.close()
+            dec.stdout.close()
+            dec_returncode = dec.wait()
+            enc_returncode = enc.wait()
+
+        if not ok:
+            enc_log.seek(0)
+            raise RuntimeError(f"ffmpeg encoding failed: {enc_log.read()}")
+        if dec_returncode != 0:
+            dec_log.seek(0)
+            raise RuntimeError(f"ffmpeg extraction failed: {dec_log.read()}")
+        if capacity == 0:
+            stego_path.unlink(missing_ok=True)
             raise RuntimeError("No frames extracted from video")
-
-        # Read all frames and flatten
-        frames: List[np.ndarray] = []
-        for frame_file in frame_files:
-            frame = imageio.imread(str(frame_file)).astype(np.uint8)
-            frames.append(frame)
-
-        # Flatten all frames
-        flat = np.concatenate([f.reshape(-1) for f in frames]).astype(np.uint8)
-        capacity = flat.size
-
-        # Encode and embed message
-        bits = _encode_message_to_bits(message)
-        if bits.size > capacity:
+        if pos < bits.size:
+            stego_path.unlink(missing_ok=True)
             raise ValueError(
                 f"Video too small for message. Capacity bits={capacity}, needed={bits.size}"
             )
-
-        # Embed bits into LSBs
-        for i in range(bits.size):
-            if bits[i]:
-                flat[i] = flat[i] | 0x01
-            else:
-                flat[i] = flat[i] & 0xFE
-
-        # Reshape back into frames
-        idx = 0
-        for i in range(len(frames)):
-            size = frames[i].size
-            frames[i] = flat[idx : idx + size].reshape(frames[i].shape).astype(np.uint8)
-            idx += size
-
-        # Write frames back as PNG
-        for i, frame in enumerate(frames):
-            frame_file = temp_dir / f"frame_{i+1:06d}.png"
-            imageio.imwrite(str(frame_file), frame)
-
-        # Encode video using ffmpeg with FFV1
-        output_pattern = str(temp_dir / "frame_%06d.png")
-        encode_cmd = [
-            "ffmpeg", "-y",
-            "-framerate", str(fps),
-            "-i", output_pattern,
-            "-c:v", "ffv1",
-            "-level", "3",
-            str(stego_path)
-        ]
-
-        result = subprocess.run(encode_cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise RuntimeError(f"ffmpeg encoding failed: {result.stderr}")
-
-    finally:
-        # Cleanup temp directory
-        if temp_dir.exists():
-            shutil.rmtree(temp_dir)
+        if enc_returncode != 0:
+            enc_log.seek(0)
+            raise RuntimeError(f"ffmpeg encoding failed: {enc_log.read()}")
 
 
 def extract_lsb_video(stego_path: PathLike) -> str:
@@ -192,13 +202,29 @@ def extract_lsb_video(stego_path: PathLike) -> str:
         return f"[Failed to open video: {e}]"
     
     bits_list: List[np.ndarray] = []
+    total = 0
+    needed = None  # known once the length header has been read
 
     try:
         for frame_idx, frame in enumerate(reader):
-            frame = frame.astype(np.uint8)
-            flat = frame.reshape(-1)
-            frame_bits = flat & 1
-            bits_list.append(frame_bits)
+            # frames are already uint8; asarray is a no-op for them
+            flat = np.asarray(frame, dtype=np.uint8).reshape(-1)
+            if needed is not None:
+                flat = flat[: needed - total]
+            bits_list.append(flat & 1)
+            total += flat.size
+
+            if needed is None and total >= HEADER_BYTES * 8:
+                header = np.concatenate(bits_list)[: HEADER_BYTES * 8]
+                length = int.from_bytes(np.packbits(header).tobytes(), byteorder="big")
+                # An implausible header can't decode however much is read
+                if 0 < length <= MAX_PAYLOAD_BYTES:
+                    needed = HEADER_BYTES * 8 + length * 8
+                else:
+                    needed = HEADER_BYTES * 8
+            # Stop decoding frames once the payload is complete
+            if needed is not None and total >= needed:
+                break
     except Exception as e:
         return f"[Error reading frames: {e}]"
     finally:
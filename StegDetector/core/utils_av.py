@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Tuple
 
@@ -19,11 +20,13 @@ AUDIO_EXTENSIONS = {".wav", ".mp3", ".flac", ".ogg", ".m4a"}
 VIDEO_EXTENSIONS = {".mp4", ".avi", ".mkv", ".mov", ".flv"}
 
 
+@lru_cache(maxsize=256)
 def is_audio_file(path: str) -> bool:
     ext = Path(path).suffix.lower()
     return ext in AUDIO_EXTENSIONS
 
 
+@lru_cache(maxsize=256)
 def is_video_file(path: str) -> bool:
     ext = Path(path).suffix.lower()
     return ext in VIDEO_EXTENSIONS
@@ -63,18 +66,19 @@ def extract_frames(video_path: str, max_frames: int = 50, frame_step: int = 5) -
     # -------------------- Try OpenCV first --------------------
     cap = cv2.VideoCapture(video_path)
     if cap.isOpened():
-        frame_index = 0
-        while True:
+        # Same frames as reading everything and keeping every frame_step-th,
+        # but the skipped ones are only grabbed (demuxed), never decoded
+        # into an image.
+        while len(frames) < max_frames:
             ret, frame = cap.read()
             if not ret:
                 break
+            frames.append(frame)
 
-            if frame_index % frame_step == 0:
-                frames.append(frame)
-                if len(frames) >= max_frames:
-                    break
-
-            frame_index += 1
+            if len(frames) >= max_frames:
+                break
+            if not all(cap.grab() for _ in range(frame_step - 1)):
+                break
 
         cap.release()
 
@@ -1,5 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+import os
 
 import numpy as np
 import cv2
@@ -15,11 +18,22 @@ MODELS_DIR = Path("models")
 VIDEO_SCALER_PATH = MODELS_DIR / "video_scaler.joblib"
 VIDEO_SVM_PATH = MODELS_DIR / "video_svm.joblib"
 
+# Per-frame OpenCV work releases the GIL, so frames are spread over threads
+_FRAME_WORKERS = os.cpu_count() or 1
+
 
 # ========================
 # V1: Frame-based LSB Detector
 # ========================
 
+def _frame_lsb_counts(frame: np.ndarray) -> tuple[int, int]:
+    """(grayscale pixels with LSB 1, grayscale pixels) for one BGR frame."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    # AND + count in OpenCV's C core, in place on the grayscale buffer
+    cv2.bitwise_and(gray, 1, dst=gray)
+    return int(cv2.countNonZero(gray)), gray.size
+
+
 def frame_lsb_statistics(frames: List[np.ndarray]) -> Dict[str, Any]:
     """
     Compute simple LSB stats over a list of frames (BGR images).
@@ -31,18 +45,14 @@ def frame_lsb_statistics(frames: List[np.ndarray]) -> Dict[str, Any]:
             "verdict": "No frames extracted"
         }
 
-    all_lsb = []
-    for frame in frames:
-        # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        lsb = gray & 1
-        all_lsb.append(lsb.flatten())
+    with ThreadPoolExecutor(max_workers=_FRAME_WORKERS) as ex:
+        counts = list(ex.map(_frame_lsb_counts, frames))
 
-    all_lsb = np.concatenate(all_lsb)
-    ones = np.count_nonzero(all_lsb)
-    zeros = all_lsb.size - ones
-    p1 = ones / float(all_lsb.size)
-    p0 = zeros / float(all_lsb.size)
+    ones = sum(c[0] for c in counts)
+    total = sum(c[1] for c in counts)
+    zeros = total - ones
+    p1 = ones / float(total)
+    p0 = zeros / float(total)
 
     balance = 1.0 - abs(p1 - 0.5) * 2.0  # in [0,1]
 
@@ -66,6 +76,52 @@ def frame_lsb_statistics(frames: List[np.ndarray]) -> Dict[str, Any]:
 # V2: Frame residual features + SVM (Best Video Method)
 # ========================
 
+def _frame_residual_hist(frame: np.ndarray, bins: int) -> np.ndarray:
+    """Residual histogram (gray - blurred gray) of one RGB frame."""
+    # imageio returns RGB frames
+    gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+    # Must stay GaussianBlur((5, 5), 0): OpenCV runs it as a cached
+    # fixed-point separable kernel on uint8, and cheaper stand-ins
+    # (boxFilter, or sepFilter2D with getGaussianKernel) round differently.
+    # Changing the blur means re-running training/train_video_svm.py.
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+
+    # widening subtract in one OpenCV pass (no int16 copies of the inputs)
+    resid = cv2.subtract(gray, blurred, dtype=cv2.CV_16S)
+
+    # Per-value counts with calcHist on uint8: residual + 41 saturates, so
+    # values below -40 land on 0, [-40, 40] on 1..81, and values above 40
+    # on 82..255.
+    shifted = cv2.add(resid, 41, dtype=cv2.CV_8U)
+    per_value = cv2.calcHist([shifted], [0], None, [256], [0, 256]).ravel()
+    return _fold_residual_counts(per_value[1:82], bins)
+
+
+@lru_cache(maxsize=8)
+def _residual_bins(bins: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    For np.histogram(resid, bins, range=(-40, 40)): the bin of each integer
+    residual -40..40, and the bin widths.
+    """
+    values = np.arange(-40, 41)
+    edges = np.histogram_bin_edges(values, bins=bins, range=(-40, 40))
+    bin_of = np.array(
+        [np.histogram([v], bins=edges)[0].argmax() for v in values]
+    )
+    return bin_of, np.diff(edges)
+
+
+def _fold_residual_counts(per_value: np.ndarray, bins: int) -> np.ndarray:
+    """
+    Counts of residuals -40..40 -> the same density histogram as
+    np.histogram(resid, bins=bins, range=(-40, 40), density=True).
+    """
+    bin_of, widths = _residual_bins(bins)
+    n = np.bincount(bin_of, weights=per_value, minlength=bins)
+    hist = n / widths / n.sum()
+    return hist.astype(np.float32)
+
+
 def extract_video_features(
     path: str | Path,
     max_frames: int = 40,
@@ -93,7 +149,7 @@ def extract_video_features(
     for idx, frame in enumerate(reader):
         if idx % frame_step != 0:
             continue
-        frames.append(frame.astype(np.uint8))
+        frames.append(np.asarray(frame, dtype=np.uint8))
         if len(frames) >= max_frames:
             break
 
@@ -102,22 +158,8 @@ def extract_video_features(
     if not frames:
         raise ValueError("No frames extracted from video.")
 
-    feats_per_frame: List[np.ndarray] = []
-
-    for frame in frames:
-        # imageio returns RGB frames
-        gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-
-        resid = gray.astype(np.int16) - blurred.astype(np.int16)
-
-        hist, _ = np.histogram(
-            resid,
-            bins=bins,
-            range=(-40, 40),
-            density=True,
-        )
-        feats_per_frame.append(hist.astype(np.float32))
+    with ThreadPoolExecutor(max_workers=_FRAME_WORKERS) as ex:
+        feats_per_frame = list(ex.map(partial(_frame_residual_hist, bins=bins), frames))
 
     feats = np.stack(feats_per_frame, axis=0)   # (n_frames, bins)
     feat_mean = feats.mean(axis=0)              # (bins,)
@@ -126,6 +168,29 @@ def extract_video_features(
 
 
 
+@lru_cache(maxsize=1)
+def _load_video_models_cached(
+    scaler_mtime_ns: int, svm_mtime_ns: int
+) -> Tuple[StandardScaler, SVC]:
+    return joblib.load(VIDEO_SCALER_PATH), joblib.load(VIDEO_SVM_PATH)
+
+
+def _load_video_models() -> Optional[Tuple[StandardScaler, SVC]]:
+    """
+    Load the V2 scaler and SVM once and keep them in memory.
+    The cache is keyed on the files' mtimes, so retrained models are picked up.
+    Returns None when the models have not been trained yet.
+    """
+    try:
+        mtimes = (
+            VIDEO_SCALER_PATH.stat().st_mtime_ns,
+            VIDEO_SVM_PATH.stat().st_mtime_ns,
+        )
+    except FileNotFoundError:
+        return None
+    return _load_video_models_cached(*mtimes)
+
+
 def video_frame_svm(path: str) -> Dict[str, Any]:
     """
     Run frame-feature+SVM model on video.
@@ -138,26 +203,24 @@ def video_frame_svm(path: str) -> Dict[str, Any]:
     """
     method_name = "V2_frame_SVM"
 
-    # 1) Check that model files exist
-    if not VIDEO_SCALER_PATH.exists() or not VIDEO_SVM_PATH.exists():
+    # 1) Load scaler + SVM (once; cached in memory)
+    try:
+        models = _load_video_models()
+    except Exception as e:
         return {
             "method": method_name,
             "score": None,
-            "verdict": "Model not trained yet. Run training/train_video_svm.py.",
+            "verdict": f"Could not load video SVM model: {e}",
         }
-
-    # 2) Load scaler + SVM
-    try:
-        scaler: StandardScaler = joblib.load(VIDEO_SCALER_PATH)
-        clf: SVC = joblib.load(VIDEO_SVM_PATH)
-    except Exception as e:
+    if models is None:
         return {
             "method": method_name,
             "score": None,
-            "verdict": f"Could not load video SVM model: {e}",
+            "verdict": "Model not trained yet. Run training/train_video_svm.py.",
         }
+    scaler, clf = models
 
-    # 3) Extract features
+    # 2) Extract features
     try:
         feats = extract_video_features(path)  # 1D vector
     except Exception as e:
@@ -167,7 +230,7 @@ def video_frame_svm(path: str) -> Dict[str, Any]:
             "verdict": f"Feature extraction failed: {e}",
         }
 
-    # 4) Scale features – this is where the dimension mismatch happened
+    # 3) Scale features – this is where the dimension mismatch happened
     try:
         feats_scaled = scaler.transform([feats])  # shape (1, n_features)
     except Exception as e:
@@ -185,7 +248,7 @@ def video_frame_svm(path: str) -> Dict[str, Any]:
             ),
         }
 
-    # 5) Predict probability of stego
+    # 4) Predict probability of stego
     try:
         if hasattr(clf, "predict_proba"):
             proba = float(clf.predict_proba(feats_scaled)[0, 1])
@@ -200,7 +263,7 @@ def video_frame_svm(path: str) -> Dict[str, Any]:
             "verdict": f"Video SVM prediction failed: {e}",
         }
 
-    # 6) Map probability -> human-readable verdict
+    # 5) Map probability -> human-readable verdict
     if proba < 0.4:
         verdict = "Likely clean"
     elif proba < 0.6:
@@ -222,7 +285,8 @@ def analyze_video(path: str) -> Dict[str, Any]:
     """
     path = str(path)
 
-    # Extract frames once for V1
+    # Extract frames once for V1; V2 samples its own RGB frames with imageio,
+    # matching the pipeline its SVM was trained on
     frames = extract_frames(path, frame_step=10, max_frames=200)
     v1_result = frame_lsb_statistics(frames)
     v2_result = video_frame_svm(path)
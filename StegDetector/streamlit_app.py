@@ -1,20 +1,24 @@
 # streamlit_app.py
 from __future__ import annotations
 
+import atexit
+import hashlib
 import os
 import subprocess
 import tempfile
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple
 
 import streamlit as st
 
 from auth_db import init_db, create_user, verify_user
-from core.audio_detector import analyze_audio
-from core.video_detector import analyze_video
-from core.stego_audio import embed_lsb_audio, extract_lsb_audio
-from core.stego_video import embed_lsb_video, extract_lsb_video
-from core.utils_av import extract_audio_from_video, ensure_dir
+
+# The core.* modules (NumPy, numba, librosa, OpenCV, MoviePy) are imported
+# where they are first used: the login page and audio-only sessions then
+# never load the video stack.
 
 
 # Practical limits for the public Streamlit demo (Cloud)
@@ -26,122 +30,132 @@ MAX_VIDEO_MESSAGE_CHARS = 20000         # safe upper bound for video messages
 MAX_EXTRACT_FILE_BYTES = 300 * 1024 * 1024  # 300 MB for Extract tab
 
 
-# Global CSS tweaks for a slightly softer UI
-st.markdown(
-    """
-    <style>
-    /* Soften the Quick help expander */
-    @media (prefers-color-scheme: light) {
-        div[data-testid="stExpander"] {
-            border-radius: 12px !important;
-            border: 1px solid #e5e7eb !important;
-            background-color: #fafafa !important;
-        }
-        div[data-testid="stExpander"] > details {
-            padding: 0.25rem 0.75rem !important;
-        }
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
-
-
 # ---------- UI/UX HELPERS ----------
 
 from shutil import which
 
+@st.cache_resource(show_spinner=False)
 def has_ffmpeg() -> bool:
-    """Return True if ffmpeg is available on PATH."""
+    """Return True if ffmpeg is available on PATH (looked up once per process)."""
     return which("ffmpeg") is not None
 
+# Each tab is a fragment (Streamlit >= 1.37): its widgets rerun only that
+# tab, not the sidebar and the other two. Older versions rerun everything.
+_tab_fragment = getattr(st, "fragment", lambda fn: fn)
+
+
+# Shared file and stego-related session keys (login state is kept)
+_RESET_KEYS = (
+    "shared_file_path",
+    "shared_file_upload",
+    "shared_file_sha1",
+    "shared_file_id",
+    "shared_file_seen_ids",
+    "shared_file_name",
+    "shared_file_kind",
+    "shared_file_suffix",
+    "stego_path",
+    "stego_filename",
+    "has_stego",
+    # include obvious temporary flags if present
+    "embed_single_message",
+    "embed_both_same",
+    "embed_video_frames_msg",
+    "embed_audio_track_msg",
+    "use_same_message_checkbox",
+    "embed_video_mode",
+    "extract_video_mode",
+)
+
+
 def reset_app_state() -> None:
     """Clear shared file and stego-related session keys without affecting login state."""
-    for key in (
-        "shared_file_bytes",
-        "shared_file_name",
-        "shared_file_kind",
-        "shared_file_suffix",
-        "stego_bytes",
-        "stego_filename",
-        "has_stego",
-        # include obvious temporary flags if present
-        "embed_single_message",
-        "embed_both_same",
-        "embed_video_frames_msg",
-        "embed_audio_track_msg",
-        "use_same_message_checkbox",
-        "embed_video_mode",
-        "extract_video_mode",
-    ):
-        if key in st.session_state:
-            st.session_state.pop(key, None)
+    _discard_shared_file()
+    _discard_stego_file()
+    ss = st.session_state
+    for key in _RESET_KEYS:
+        ss.pop(key, None)
+
+# Global CSS (light mode only), sent as a single <style> block per run
+_GLOBAL_CSS = """
+<style>
+@media (prefers-color-scheme: light) {
+    /* Polished look */
+    .stApp {
+        background-color: #f5f7fb;
+    }
+    [data-testid="stSidebar"] {
+        background-color: #ffffff;
+        border-right: 1px solid #e5e7eb;
+    }
+    section.main > div {
+        padding-top: 1rem;
+    }
+    .stButton > button {
+        border-radius: 999px;
+    }
 
-def inject_global_css():
-    """Inject custom CSS for a polished look (light mode only)."""
-    st.markdown(
-        """
-        <style>
-        @media (prefers-color-scheme: light) {
-            .stApp {
-                background-color: #f5f7fb;
-            }
-            [data-testid="stSidebar"] {
-                background-color: #ffffff;
-                border-right: 1px solid #e5e7eb;
-            }
-            section.main > div {
-                padding-top: 1rem;
-            }
-            .stButton > button {
-                border-radius: 999px;
-            }
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    /* Soften the Quick help expander */
+    div[data-testid="stExpander"] {
+        border-radius: 12px !important;
+        border: 1px solid #e5e7eb !important;
+        background-color: #fafafa !important;
+    }
+    div[data-testid="stExpander"] > details {
+        padding: 0.25rem 0.75rem !important;
+    }
 
+    /* All multi-line text areas: stronger blue border, very light gray */
+    .stTextArea textarea {
+        border: 2px solid #2563eb !important;
+        border-radius: 8px !important;
+        background-color: #f9fafb !important;
+        font-size: 0.95rem !important;
+    }
 
-def inject_global_styles():
-    """Make text areas more visible with stronger borders and subtle background (light mode only)."""
-    st.markdown(
-        """
-        <style>
-        @media (prefers-color-scheme: light) {
-            /* All multi-line text areas */
-            .stTextArea textarea {
-                border: 2px solid #2563eb !important;   /* blue border */
-                border-radius: 8px !important;
-                background-color: #f9fafb !important;   /* very light gray */
-                font-size: 0.95rem !important;
-            }
-
-            /* Labels above text areas */
-            .stTextArea label {
-                font-weight: 600 !important;
-            }
-
-            /* Code blocks for recovered messages */
-            [data-testid="stCodeBlock"] {
-                border: 2px solid #2563eb !important;
-                border-radius: 8px !important;
-                background-color: #f9fafb !important;
-                padding: 0.5rem 0.75rem !important;
-            }
-            [data-testid="stCodeBlock"] pre {
-                color: #111827 !important;
-                font-size: 0.95rem !important;
-            }
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    /* Labels above text areas */
+    .stTextArea label {
+        font-weight: 600 !important;
+    }
+
+    /* Code blocks for recovered messages */
+    [data-testid="stCodeBlock"] {
+        border: 2px solid #2563eb !important;
+        border-radius: 8px !important;
+        background-color: #f9fafb !important;
+        padding: 0.5rem 0.75rem !important;
+    }
+    [data-testid="stCodeBlock"] pre {
+        color: #111827 !important;
+        font-size: 0.95rem !important;
+    }
+}
+</style>
+"""
+
+
+def inject_global_css():
+    """
+    Inject the custom CSS (light mode only). Styles are page elements, so
+    this has to run on every rerun; st.html (Streamlit >= 1.33) sends a
+    style-only block outside the page layout, older versions get a
+    markdown element.
+    """
+    if hasattr(st, "html"):
+        st.html(_GLOBAL_CSS)
+    else:
+        st.markdown(_GLOBAL_CSS, unsafe_allow_html=True)
 
 
 # ---------- FILE TYPE HELPERS ----------
 
+# Same extensions as core.utils_av, which is not imported here (OpenCV)
+_EXT_KIND = {
+    ".wav": "audio", ".mp3": "audio", ".flac": "audio", ".ogg": "audio", ".m4a": "audio",
+    ".mp4": "video", ".avi": "video", ".mkv": "video", ".mov": "video", ".flv": "video",
+}
+
+
 def classify_file_type(filename: str) -> Tuple[Optional[str], str]:
     """
     Decide whether a file should be treated as audio or video based on its extension.
@@ -150,15 +164,11 @@ def classify_file_type(filename: str) -> Tuple[Optional[str], str]:
         (kind, suffix)
         kind in {"audio", "video", None}
     """
-    suffix = Path(filename).suffix.lower()
-    audio_exts = {".wav", ".mp3", ".flac", ".ogg", ".m4a"}
-    video_exts = {".mp4", ".avi", ".mkv", ".mov", ".flv"}
-
-    if suffix in audio_exts:
-        return "audio", suffix
-    if suffix in video_exts:
-        return "video", suffix
-    return None, suffix
+    # Same suffix as Path(filename).suffix for upload names (a leading
+    # dot, as in ".wav", is a hidden file with no suffix)
+    dot = filename.rfind(".")
+    suffix = filename[dot:].lower() if dot > 0 else ""
+    return _EXT_KIND.get(suffix), suffix
 
 
 # ---------- SHARED FILE STATE (PERSIST ACROSS TABS) ----------
@@ -169,7 +179,9 @@ def init_app_state():
 
     # Shared uploaded file for all tabs
     defaults = {
-        "shared_file_bytes": None,
+        "shared_file_path": None,   # materialized upload on disk
+        "shared_file_sha1": None,
+        "shared_file_id": None,     # Streamlit upload id, to skip re-hashing on reruns
         "shared_file_name": None,
         "shared_file_kind": None,   # "audio" or "video"
         "shared_file_suffix": None,
@@ -178,10 +190,78 @@ def init_app_state():
         st.session_state.setdefault(k, v)
 
 
-def update_shared_file(uploaded_file, max_bytes: int = MAX_FILE_BYTES) -> None:
+@st.cache_resource(show_spinner=False)
+def _upload_dir() -> Path:
+    """One temp dir per server process for materialized uploads, removed at exit."""
+    tmp = tempfile.TemporaryDirectory(prefix="stegdetector_uploads_")
+    atexit.register(tmp.cleanup)
+    return Path(tmp.name)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class _SessionUpload:
+    """
+    A session's on-disk copy of its shared upload. The file is removed by
+    discard(), or once the session state holding this object is dropped
+    (session ended); the upload dir's atexit cleanup catches the rest.
+    """
+
+    __slots__ = ("path", "_finalizer", "__weakref__")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._finalizer = weakref.finalize(self, _remove_quietly, path)
+
+    def discard(self) -> None:
+        self._finalizer()
+
+
+_COPY_CHUNK_BYTES = 1 << 20  # 1 MiB
+
+
+def _store_upload(uploaded_file, suffix: str) -> Tuple[_SessionUpload, str]:
     """
-    Store the uploaded file (bytes + metadata) in session_state so that
-    all tabs can reuse it.
+    Stream an upload to a new file in 1 MiB chunks, hashing it on the way,
+    and return (upload, sha1). Each session owns its file, so replacing or
+    resetting it never touches another session's upload.
+    """
+    digest = hashlib.sha1()
+    uploaded_file.seek(0)
+    with tempfile.NamedTemporaryFile(
+        dir=_upload_dir(), suffix=suffix, delete=False
+    ) as tmp:
+        upload = _SessionUpload(tmp.name)
+        while chunk := uploaded_file.read(_COPY_CHUNK_BYTES):
+            digest.update(chunk)
+            tmp.write(chunk)
+    uploaded_file.seek(0)
+    return upload, digest.hexdigest()
+
+
+def _discard_shared_file() -> None:
+    """Delete this session's copy of the shared upload, if any."""
+    upload = st.session_state.get("shared_file_upload")
+    if upload is not None:
+        upload.discard()
+
+
+def update_shared_file(
+    uploaded_file, uploader_key: str, max_bytes: int = MAX_FILE_BYTES
+) -> None:
+    """
+    Store the uploaded file (on-disk path + metadata) in session_state so
+    that all tabs can reuse it.
+
+    uploader_key:
+        - widget key of the tab's file_uploader. Each uploader returns its
+          file again on every rerun; only a file it has not returned before
+          replaces the shared one.
 
     max_bytes:
         - default: MAX_FILE_BYTES (50 MB) for Analyze and Embed tabs
@@ -211,33 +291,54 @@ def update_shared_file(uploaded_file, max_bytes: int = MAX_FILE_BYTES) -> None:
         )
         return
 
-    st.session_state["shared_file_bytes"] = uploaded_file.getvalue()
+    # The uploader hands the same file back on every rerun. Compare with
+    # what this uploader returned last, not with the shared file: another
+    # tab's uploader may hold a different file, and the two would keep
+    # replacing each other.
+    file_id = getattr(uploaded_file, "file_id", None)
+    seen = st.session_state.setdefault("shared_file_seen_ids", {})
+    if file_id is not None and seen.get(uploader_key) == file_id:
+        return
+    seen[uploader_key] = file_id
+
+    upload, sha1 = _store_upload(uploaded_file, suffix)
+    _discard_shared_file()
+    st.session_state["shared_file_upload"] = upload
+    st.session_state["shared_file_path"] = upload.path
+    st.session_state["shared_file_sha1"] = sha1
+    st.session_state["shared_file_id"] = file_id
     st.session_state["shared_file_name"] = uploaded_file.name
     st.session_state["shared_file_kind"] = kind
     st.session_state["shared_file_suffix"] = suffix
 
+    # All tabs show the shared file, so a new upload reruns the whole app
+    # rather than only the uploading tab's fragment. Without a file_id a
+    # new upload can't be told from a rerun, so no rerun then.
+    if file_id is not None and hasattr(st, "fragment"):
+        st.rerun()
+
 
 def has_shared_file() -> bool:
-    return st.session_state.get("shared_file_bytes") is not None
+    return st.session_state.get("shared_file_path") is not None
 
 
 
 def make_temp_file_from_shared() -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """
-    Materialize the shared file bytes into a real temp file on disk.
+    Return the shared file's path on disk (written once at upload time).
     Returns (temp_path, kind, suffix) or (None, None, None) if no file.
+
+    The file is shared by every tab and rerun: callers must not delete it.
     """
     if not has_shared_file():
         return None, None, None
 
-    data = st.session_state["shared_file_bytes"]
+    temp_path = st.session_state["shared_file_path"]
+    if not os.path.exists(temp_path):
+        return None, None, None
     suffix = st.session_state["shared_file_suffix"]
     kind = st.session_state["shared_file_kind"]
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        tmp.write(data)
-        temp_path = tmp.name
-
     return temp_path, kind, suffix
 
 
@@ -255,17 +356,175 @@ def show_shared_file_info():
     )
 
 
+# Longer recovered messages are shown truncated, with the full text as a download
+_PREVIEW_CHARS = 4096
+
+
+def show_recovered_message(title: str, msg: Optional[str], key: str) -> None:
+    """Show a recovered message under `title`; `key` makes its download button unique."""
+    msg = msg or ""
+    st.subheader(title)
+    st.code(msg[:_PREVIEW_CHARS], language="text")
+    if len(msg) > _PREVIEW_CHARS:
+        st.caption(f"Showing the first {_PREVIEW_CHARS} of {len(msg)} characters.")
+        st.download_button(
+            label="Download full message",
+            data=msg.encode("utf-8"),
+            file_name="recovered.txt",
+            key=f"download_recovered_{key}",
+        )
+
+
 # ---------- VIDEO AUDIO-TRACK HELPERS ----------
 
-def _mux_video_and_audio(video_path: Path | str, audio_path: Path | str, output_path: Path | str) -> Path:
+@st.cache_resource(show_spinner=False)
+def _work_dir() -> Path:
+    """
+    One scratch dir per server process for intermediate stego files,
+    removed at exit. Callers use unique file names (two sessions or tabs
+    may run at once) and delete their files when done.
+    """
+    tmp = tempfile.TemporaryDirectory(prefix="stegdetector_")
+    atexit.register(tmp.cleanup)
+    return Path(tmp.name)
+
+
+def _work_file(suffix: str) -> Path:
+    return _work_dir() / f"{uuid.uuid4().hex}{suffix}"
+
+
+def _discard_stego_file() -> None:
+    """Delete this session's previous stego output, if any."""
+    path = st.session_state.get("stego_path")
+    if path:
+        _remove_quietly(path)
+
+
+# download_button takes a zero-argument callable for `data` from 1.52 on,
+# and then only reads the file when the button is clicked.
+_LAZY_DOWNLOAD = tuple(int(p) for p in st.__version__.split(".")[:2] if p.isdigit()) >= (1, 52)
+
+
+def _lazy_file_data(path: str):
+    """`data` for st.download_button: a reader callable where supported, else the bytes."""
+    if _LAZY_DOWNLOAD:
+        return Path(path).read_bytes
+    return Path(path).read_bytes()
+
+
+# PCM layout of decoded audio tracks: the same 44.1 kHz stereo that
+# extract_audio_from_video (MoviePy) writes, which extraction reads back.
+_TRACK_SAMPLE_RATE = 44100
+_TRACK_CHANNELS = 2
+
+
+def _audio_track_cmd(video_path: Path | str) -> list:
+    """ffmpeg command decoding a video's first audio track to s16le PCM on stdout."""
+    return [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel", "error",
+        "-nostdin",
+        "-i", str(video_path),
+        "-map", "0:a:0",
+        "-vn",
+        "-ac", str(_TRACK_CHANNELS),
+        "-ar", str(_TRACK_SAMPLE_RATE),
+        "-f", "s16le",
+        "-acodec", "pcm_s16le",
+        "pipe:1",
+    ]
+
+
+def _read_audio_track_pcm(video_path: Path | str):
+    """
+    Decode a video's first audio track straight into memory as int16 PCM
+    (interleaved, _TRACK_CHANNELS x _TRACK_SAMPLE_RATE) through an ffmpeg
+    pipe, without writing a WAV. Returns None if there is no audio track.
+    """
+    import numpy as np
+
+    if not has_ffmpeg():
+        raise RuntimeError(
+            "ffmpeg is required to decode the audio track but was not found in PATH."
+        )
+
+    cmd = _audio_track_cmd(video_path)
+    with tempfile.TemporaryFile(mode="w+", errors="replace") as log:
+        proc = subprocess.run(
+            cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=log
+        )
+        if proc.returncode != 0:
+            log.seek(0)
+            err = log.read()
+            if "matches no streams" in err:
+                return None
+            raise RuntimeError(
+                "ffmpeg failed while decoding the audio track.\n\n"
+                f"Command: {' '.join(cmd)}\n\n"
+                f"Error:\n{err}"
+            )
+
+    if not proc.stdout:
+        return None
+    # bytearray -> writable array, embedded into in place
+    return np.frombuffer(bytearray(proc.stdout), dtype="<i2")
+
+
+def _extract_audio_track_lsb(video_path: Path | str) -> Optional[str]:
+    """
+    Extract an LSB message from a video's audio track, decoding only the
+    samples the length header says the payload spans: ffmpeg is stopped
+    as soon as they have been read. Returns None if there is no audio track.
+    """
+    import numpy as np
+    from core.stego_audio import HEADER_BITS, extract_lsb_samples, payload_sample_count
+
+    cmd = _audio_track_cmd(video_path)
+    with tempfile.TemporaryFile(mode="w+", errors="replace") as log:
+        proc = subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=log
+        )
+        try:
+            pcm = proc.stdout.read(2 * HEADER_BITS)
+            needed = payload_sample_count(np.frombuffer(pcm, dtype="<i2"))
+            if needed * 2 > len(pcm):
+                pcm += proc.stdout.read(needed * 2 - len(pcm))
+            # Only a full header and payload means ffmpeg can be cut short;
+            # a short read is EOF, and then its exit status decides.
+            stopped = len(pcm) >= 2 * max(needed, HEADER_BITS)
+            if stopped:
+                proc.kill()  # the rest of the track is not needed
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+
+        if not stopped and returncode != 0:
+            log.seek(0)
+            err = log.read()
+            if "matches no streams" in err:
+                return None
+            raise RuntimeError(
+                "ffmpeg failed while decoding the audio track.\n\n"
+                f"Command: {' '.join(cmd)}\n\n"
+                f"Error:\n{err}"
+            )
+
+    if not pcm:
+        return None
+    return extract_lsb_samples(np.frombuffer(pcm[: len(pcm) // 2 * 2], dtype="<i2"))
+
+
+def _mux_video_and_audio(video_path: Path | str, audio, output_path: Path | str) -> Path:
     """
     Use ffmpeg to combine a video stream and an audio stream into a single file.
+    `audio` is either an audio file path or an int16 PCM array laid out
+    as returned by _read_audio_track_pcm, which is piped to ffmpeg.
 
     - Video is copied (no re-encode) so VIDEO LSB stego survives.
     - Audio is stored lossless so AUDIO LSB stego survives.
     """
     video_path = str(video_path)
-    audio_path = str(audio_path)
     output_path = str(output_path)
 
     if not has_ffmpeg():
@@ -273,12 +532,28 @@ def _mux_video_and_audio(video_path: Path | str, audio_path: Path | str, output_
             "ffmpeg is required to mux video and audio but was not found in PATH."
         )
 
+    if isinstance(audio, (str, Path)):
+        audio_input = ["-i", str(audio)]
+        pcm = None
+    else:
+        audio_input = [
+            "-f", "s16le",
+            "-ar", str(_TRACK_SAMPLE_RATE),
+            "-ac", str(_TRACK_CHANNELS),
+            "-i", "pipe:0",
+        ]
+        pcm = audio
+
     # Use FLAC for lossless audio in MP4, or use MKV with PCM for maximum compatibility
     cmd = [
         "ffmpeg",
+        "-hide_banner",
+        "-loglevel", "error",  # only errors reach the log, no progress lines
+        "-nostats",
         "-y",
+        "-nostdin",
         "-i", video_path,
-        "-i", audio_path,
+        *audio_input,
         "-map", "0:v:0",
         "-map", "1:a:0",
         "-c:v", "copy",        # keep video codec as-is
@@ -288,18 +563,29 @@ def _mux_video_and_audio(video_path: Path | str, audio_path: Path | str, output_
         output_path,
     ]
 
-    proc = subprocess.run(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-    if proc.returncode != 0:
-        raise RuntimeError(
-            "ffmpeg failed while combining video and audio.\n\n"
-            f"Command: {' '.join(cmd)}\n\n"
-            f"Error:\n{proc.stderr}"
+    # Log to a temp file rather than a pipe: nothing can fill up and
+    # block ffmpeg while the PCM is written to its stdin.
+    with tempfile.TemporaryFile(mode="w+", errors="replace") as log:
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL if pcm is None else subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=log,
         )
+        if pcm is not None:
+            try:
+                proc.stdin.write(memoryview(pcm).cast("B"))
+            except BrokenPipeError:
+                pass  # ffmpeg exited early; its log says why
+            finally:
+                proc.stdin.close()
+        if proc.wait() != 0:
+            log.seek(0)
+            raise RuntimeError(
+                "ffmpeg failed while combining video and audio.\n\n"
+                f"Command: {' '.join(cmd)}\n\n"
+                f"Error:\n{log.read()}"
+            )
 
     return Path(output_path)
 
@@ -308,6 +594,8 @@ def embed_video_frames_only(cover_path: str, stego_path: str, message: str) -> N
     """
     Standard VIDEO-only stego: message in the LSBs of video frames, no audio track.
     """
+    from core.stego_video import embed_lsb_video
+
     embed_lsb_video(cover_path, stego_path, message)
 
 
@@ -315,20 +603,17 @@ def embed_video_audio_only(cover_path: str, stego_path: str, message: str) -> No
     """
     Only modifies the AUDIO track of the given video; frames are kept as-is.
 
-    Output: single video+audio file with stego audio in PCM format.
+    Output: single video+audio file with stego audio in lossless FLAC.
+    The track is decoded, embedded into and muxed through pipes, in memory.
     """
-    temp_dir = Path(tempfile.gettempdir()) / "stegdetector_tmp"
-    ensure_dir(str(temp_dir))
-    src_audio = temp_dir / "cover_audio.wav"
-    stego_audio = temp_dir / "cover_audio_stego.wav"
+    from core.stego_audio import embed_lsb_samples
 
-    try:
-        extract_audio_from_video(str(cover_path), str(src_audio))
-    except Exception as e:
-        raise RuntimeError("This video has no audio track to hide a message in.") from e
+    pcm = _read_audio_track_pcm(cover_path)
+    if pcm is None:
+        raise RuntimeError("This video has no audio track to hide a message in.")
 
-    embed_lsb_audio(str(src_audio), str(stego_audio), message)
-    _mux_video_and_audio(cover_path, stego_audio, stego_path)
+    embed_lsb_samples(pcm, message)
+    _mux_video_and_audio(cover_path, pcm, stego_path)
 
 
 def embed_video_both(cover_path: str, stego_path: str, msg_video: str, msg_audio: str) -> None:
@@ -336,45 +621,122 @@ def embed_video_both(cover_path: str, stego_path: str, msg_video: str, msg_audio
     Embed one message in VIDEO frames + another in AUDIO track,
     and output ONE video file containing both.
     """
-    temp_dir = Path(tempfile.gettempdir()) / "stegdetector_tmp"
-    ensure_dir(str(temp_dir))
-
-    # 1) embed into video frames (lossless PNG codec in AVI)
-    stego_video_path = temp_dir / "cover_video_stego.avi"
-    embed_lsb_video(str(cover_path), str(stego_video_path), msg_video)
-
-    # 2) extract original audio and embed msg_audio
-    src_audio = temp_dir / "cover_audio.wav"
-    stego_audio = temp_dir / "cover_audio_stego.wav"
+    from core.stego_audio import embed_lsb_samples
+    from core.stego_video import embed_lsb_video
 
+    stego_video_path = _work_file(".avi")
     try:
-        extract_audio_from_video(str(cover_path), str(src_audio))
-    except Exception as e:
-        raise RuntimeError(
-            "Cover video has no audio track – cannot embed into both video and audio."
-        ) from e
-
-    embed_lsb_audio(str(src_audio), str(stego_audio), msg_audio)
+        # 1) + 2) run side by side: they only share the (read-only) cover, and
+        # both spend their time in ffmpeg subprocesses or NumPy
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            # 1) embed into video frames (lossless FFV1 in AVI)
+            fut_video = ex.submit(
+                embed_lsb_video, str(cover_path), str(stego_video_path), msg_video
+            )
+            # 2) decode the original audio into memory and embed msg_audio
+            fut_audio = ex.submit(_read_audio_track_pcm, cover_path)
+            # same error precedence as running them in order
+            fut_video.result()
+            pcm = fut_audio.result()
+        if pcm is None:
+            raise RuntimeError(
+                "Cover video has no audio track – cannot embed into both video and audio."
+            )
+        embed_lsb_samples(pcm, msg_audio)
 
-    # 3) mux stego video + stego audio into a single MKV WITHOUT re-encoding video
-    _mux_video_and_audio(stego_video_path, stego_audio, stego_path)
+        # 3) mux stego video + piped stego audio into a single MKV WITHOUT re-encoding video
+        _mux_video_and_audio(stego_video_path, pcm, stego_path)
+    finally:
+        stego_video_path.unlink(missing_ok=True)
 
 
 def extract_message_from_video_audio(video_path: str) -> str:
     """
     Extract LSB text message from the AUDIO TRACK of a video, if present.
     """
-    temp_dir = Path(tempfile.gettempdir()) / "stegdetector_tmp"
-    ensure_dir(str(temp_dir))
-    src_audio = temp_dir / "extract_audio.wav"
-
+    if has_ffmpeg():
+        try:
+            msg = _extract_audio_track_lsb(video_path)
+        except Exception:
+            msg = None
+        if msg is None:
+            return "[No audio track found or failed to extract audio from this video]"
+        return msg
+
+    # Without ffmpeg on PATH, decode the whole track to WAV with MoviePy
+    from core.stego_audio import extract_lsb_audio
+    from core.utils_av import extract_audio_from_video
+
+    src_audio = _work_file(".wav")
     try:
-        extract_audio_from_video(str(video_path), str(src_audio))
-    except Exception:
-        return "[No audio track found or failed to extract audio from this video]"
+        try:
+            extract_audio_from_video(str(video_path), str(src_audio))
+        except Exception:
+            return "[No audio track found or failed to extract audio from this video]"
 
-    msg = extract_lsb_audio(str(src_audio))
-    return msg
+        msg = extract_lsb_audio(str(src_audio))
+        return msg
+    finally:
+        src_audio.unlink(missing_ok=True)
+
+
+# ---------- CACHED ENTRY POINTS ----------
+# Extraction depends only on the file's bytes, so results are keyed on the
+# upload's SHA-1; the path (a per-session copy) is underscored to keep it
+# out of the cache key. Analysis also depends on the trained models, so its
+# key carries their version too.
+
+def _models_version(kind: str) -> Tuple[Optional[int], ...]:
+    """mtimes of the scaler/SVM used to analyze `kind` files (None while untrained)."""
+    if kind == "audio":
+        from core.audio_detector import AUDIO_SCALER_PATH, AUDIO_SVM_PATH
+
+        paths = (AUDIO_SCALER_PATH, AUDIO_SVM_PATH)
+    else:
+        from core.video_detector import VIDEO_SCALER_PATH, VIDEO_SVM_PATH
+
+        paths = (VIDEO_SCALER_PATH, VIDEO_SVM_PATH)
+
+    version = []
+    for model_path in paths:
+        try:
+            version.append(model_path.stat().st_mtime_ns)
+        except FileNotFoundError:
+            version.append(None)
+    return tuple(version)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _analyze_audio_cached(content_sha1: str, models_version: tuple, _path: str) -> dict:
+    from core.audio_detector import analyze_audio
+
+    return analyze_audio(_path)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _analyze_video_cached(content_sha1: str, models_version: tuple, _path: str) -> dict:
+    from core.video_detector import analyze_video
+
+    return analyze_video(_path)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _extract_lsb_audio_cached(content_sha1: str, _path: str) -> str:
+    from core.stego_audio import extract_lsb_audio
+
+    return extract_lsb_audio(_path)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _extract_lsb_video_cached(content_sha1: str, _path: str) -> str:
+    from core.stego_video import extract_lsb_video
+
+    return extract_lsb_video(_path)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _extract_video_audio_cached(content_sha1: str, _path: str) -> str:
+    return extract_message_from_video_audio(_path)
 
 
 # ---------- AUTH SCREENS ----------
@@ -426,6 +788,7 @@ def show_auth_page():
 
 # ---------- MAIN APP (AFTER LOGIN) ----------
 
+@_tab_fragment
 def show_analyze_tab():
     st.header("Analyze File for Steganography")
     st.write(
@@ -440,27 +803,29 @@ def show_analyze_tab():
         key="file_analyze",
     )
     if uploaded is not None:
-        update_shared_file(uploaded)
+        update_shared_file(uploaded, "file_analyze")
 
     show_shared_file_info()
 
-    if st.button("Run analysis", use_container_width=True):
-        if not has_shared_file():
-            st.error("Please upload an audio or video file first.")
-            return
+    # Nothing below works without a file; show_shared_file_info already
+    # asks for one
+    if not has_shared_file():
+        return
 
+    if st.button("Run analysis", use_container_width=True):
         temp_path, kind, _ = make_temp_file_from_shared()
         if temp_path is None:
             st.error("Internal error: shared file missing.")
             return
+        sha1 = st.session_state["shared_file_sha1"]
 
         try:
             if kind == "audio":
                 st.info("Detected: **Audio file** – running audio steganalysis.")
-                result = analyze_audio(temp_path)
+                result = _analyze_audio_cached(sha1, _models_version(kind), temp_path)
             elif kind == "video":
                 st.info("Detected: **Video file** – running video steganalysis on frames.")
-                result = analyze_video(temp_path)
+                result = _analyze_video_cached(sha1, _models_version(kind), temp_path)
             else:
                 st.error("Unsupported file type.")
                 return
@@ -469,13 +834,9 @@ def show_analyze_tab():
             st.json(result)
         except Exception as e:
             st.error(f"Error during analysis: {e}")
-        finally:
-            try:
-                os.remove(temp_path)
-            except OSError:
-                pass
 
 
+@_tab_fragment
 def show_embed_tab():
     st.header("Embed a Secret Message")
     st.write(
@@ -503,7 +864,7 @@ def show_embed_tab():
         key="file_embed",
     )
     if uploaded is not None:
-        update_shared_file(uploaded)
+        update_shared_file(uploaded, "file_embed")
 
     show_shared_file_info()
 
@@ -525,6 +886,7 @@ def show_embed_tab():
     message = None
     msg_video = None
     msg_audio = None
+    use_same_message = True  # the checkbox's value; it only exists in "Both" mode
 
     if kind == "audio" or video_mode == "Video frames only" or video_mode == "Audio track only":
         # Single message for audio or single video/audio mode
@@ -569,7 +931,6 @@ def show_embed_tab():
                 st.error("Please enter a message to hide.")
                 return
         elif video_mode == "Both frames + audio":
-            use_same_message = st.session_state.get("embed_both_same_message", st.session_state.get("use_same_message_checkbox", True))
             if use_same_message:
                 if not message:
                     st.error("Please enter a message to hide.")
@@ -599,10 +960,6 @@ def show_embed_tab():
                     )
                     return
             elif video_mode == "Both frames + audio":
-                use_same_message = st.session_state.get(
-                    "embed_both_same_message",
-                    st.session_state.get("use_same_message_checkbox", True)
-                )
                 if use_same_message:
                     if len(message) > MAX_VIDEO_MESSAGE_CHARS:
                         st.error(
@@ -640,14 +997,16 @@ def show_embed_tab():
             else:
                 out_ext = ".mkv"
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=out_ext) as tmp:
-            stego_path = tmp.name
+        stego_path = str(_work_file(out_ext))
+        kept = False
 
         try:
             with st.spinner("Embedding your secret message into the file. This may take several seconds for videos..."):
                 if kind == "audio":
                     st.info("Embedding into AUDIO samples")
                     try:
+                        from core.stego_audio import embed_lsb_audio
+
                         embed_lsb_audio(temp_path, stego_path, message)
                     except ValueError as e:
                         st.error(str(e))
@@ -687,9 +1046,8 @@ def show_embed_tab():
                             st.error("Video steganography requires ffmpeg, which was not found on this system. Please install ffmpeg or use audio-only files.")
                             return
                         st.info("Embedding into BOTH video frames and audio track.")
-                        use_same_msg = st.session_state.get("use_same_message_checkbox", True)
                         try:
-                            if use_same_msg:
+                            if use_same_message:
                                 embed_video_both(temp_path, stego_path, message, message)
                             else:
                                 embed_video_both(temp_path, stego_path, msg_video, msg_audio)
@@ -708,25 +1066,27 @@ def show_embed_tab():
             st.balloons()
 
             download_name = f"{base_stem}_stego{out_ext}"
-            with open(stego_path, "rb") as f:
-                stego_bytes = f.read()
-            
-            # Store in session state for persistent download
-            st.session_state["stego_bytes"] = stego_bytes
+
+            # Keep only the path in session state; the bytes are read when
+            # the download button is rendered (or clicked, where supported)
+            _discard_stego_file()
+            st.session_state["stego_path"] = stego_path
             st.session_state["stego_filename"] = download_name
             st.session_state["has_stego"] = True
+            kept = True
 
         except Exception as e:
             st.error(f"Error during embedding: {e}")
         finally:
-            for p in (temp_path, stego_path):
+            if not kept:
                 try:
-                    os.remove(p)
+                    os.remove(stego_path)
                 except OSError:
                     pass
 
     # Persistent download section
-    if st.session_state.get("has_stego") and st.session_state.get("stego_bytes") is not None:
+    stego_file = st.session_state.get("stego_path")
+    if st.session_state.get("has_stego") and stego_file and os.path.exists(stego_file):
         st.info(
             "Click **Download stego file** below. "
             "If your browser does not start downloading within a few seconds, "
@@ -734,13 +1094,14 @@ def show_embed_tab():
         )
         st.download_button(
             label="Download stego file",
-            data=st.session_state["stego_bytes"],
+            data=_lazy_file_data(stego_file),
             file_name=st.session_state.get("stego_filename", "stego_output"),
             key="download_stego_button",
             use_container_width=True,
         )
 
 
+@_tab_fragment
 def show_extract_tab():
     st.header("Extract a Secret Message")
     st.write(
@@ -754,10 +1115,15 @@ def show_extract_tab():
         key="file_extract",
     )
     if uploaded is not None:
-        update_shared_file(uploaded, max_bytes=MAX_EXTRACT_FILE_BYTES)
+        update_shared_file(uploaded, "file_extract", max_bytes=MAX_EXTRACT_FILE_BYTES)
 
     show_shared_file_info()
 
+    # Nothing below works without a file; show_shared_file_info already
+    # asks for one
+    if not has_shared_file():
+        return
+
     kind = st.session_state.get("shared_file_kind")
 
     video_mode = None
@@ -769,21 +1135,17 @@ def show_extract_tab():
         )
 
     if st.button("Extract message", use_container_width=True):
-        if not has_shared_file():
-            st.error("Please upload a stego file first.")
-            return
-
         temp_path, kind, _ = make_temp_file_from_shared()
         if temp_path is None:
             st.error("Internal error: shared file missing.")
             return
+        sha1 = st.session_state["shared_file_sha1"]
 
         try:
             if kind == "audio":
                 st.info("Detected AUDIO file – extracting from audio samples.")
-                msg = extract_lsb_audio(temp_path)
-                st.subheader("Recovered message")
-                st.code(msg or "", language="text")
+                msg = _extract_lsb_audio_cached(sha1, temp_path)
+                show_recovered_message("Recovered message", msg, "audio")
             elif kind == "video":
                 st.info("Detected VIDEO file.")
                 # Default when None: auto
@@ -792,39 +1154,26 @@ def show_extract_tab():
                 else:
                     mode_label = video_mode
 
+                # Every video mode decodes through ffmpeg
+                if not has_ffmpeg():
+                    st.error("Video steganography requires ffmpeg, which was not found on this system. Please install ffmpeg or use audio-only files.")
+                    return
+
                 if mode_label.startswith("Auto"):
-                    if not has_ffmpeg():
-                        st.error("Video steganography requires ffmpeg, which was not found on this system. Please install ffmpeg or use audio-only files.")
-                        return
-                    msg_frames = extract_lsb_video(temp_path)
-                    msg_audio = extract_message_from_video_audio(temp_path)
-                    st.subheader("Recovered from VIDEO FRAMES")
-                    st.code(msg_frames or "", language="text")
-                    st.subheader("Recovered from AUDIO TRACK")
-                    st.code(msg_audio or "", language="text")
+                    msg_frames = _extract_lsb_video_cached(sha1, temp_path)
+                    msg_audio = _extract_video_audio_cached(sha1, temp_path)
+                    show_recovered_message("Recovered from VIDEO FRAMES", msg_frames, "frames")
+                    show_recovered_message("Recovered from AUDIO TRACK", msg_audio, "track")
                 elif mode_label.startswith("Video frames"):
-                    if not has_ffmpeg():
-                        st.error("Video steganography requires ffmpeg, which was not found on this system. Please install ffmpeg or use audio-only files.")
-                        return
-                    msg_frames = extract_lsb_video(temp_path)
-                    st.subheader("Recovered from VIDEO FRAMES")
-                    st.code(msg_frames or "", language="text")
+                    msg_frames = _extract_lsb_video_cached(sha1, temp_path)
+                    show_recovered_message("Recovered from VIDEO FRAMES", msg_frames, "frames")
                 else:  # audio track only
-                    if not has_ffmpeg():
-                        st.error("Video steganography requires ffmpeg, which was not found on this system. Please install ffmpeg or use audio-only files.")
-                        return
-                    msg_audio = extract_message_from_video_audio(temp_path)
-                    st.subheader("Recovered from AUDIO TRACK")
-                    st.code(msg_audio or "", language="text")
+                    msg_audio = _extract_video_audio_cached(sha1, temp_path)
+                    show_recovered_message("Recovered from AUDIO TRACK", msg_audio, "track")
             else:
                 st.error("Unsupported file type.")
         except Exception as e:
             st.error(f"Error during extraction: {e}")
-        finally:
-            try:
-                os.remove(temp_path)
-            except OSError:
-                pass
 
 
 def show_main_app():
@@ -921,7 +1270,6 @@ def main():
         unsafe_allow_html=True,
     )
     
-    inject_global_styles()
     inject_global_css()
     init_db()
     init_app_state()